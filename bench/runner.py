@@ -0,0 +1,155 @@
+"""Бенчмарк игрового тика на сценариях из bench/scenarios.py.
+
+    python -m bench.runner                       # все сценарии -> bench_results.json
+    python -m bench.runner --only arena_500 maze_swarm --out before.json
+    python -m bench.runner --out after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from bench.scenarios import default_scenarios
+
+
+def _percentile(sorted_vals, q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+
+def _run_ticks(scenario, world, ticks: int, timings=None):
+    dt = world.fixed_dt
+    done = 0
+    for tick in range(ticks):
+        scenario.drive(world, tick)
+        if timings is not None:
+            t0 = time.perf_counter()
+            alive = world.step(dt)
+            timings.append(time.perf_counter() - t0)
+        else:
+            alive = world.step(dt)
+        done += 1
+        if not alive:
+            break
+    return done
+
+
+def run_scenario(scenario, seed: int, ticks=None, warmup: int = 30, measure_memory: bool = True):
+    ticks = scenario.ticks if ticks is None else int(ticks)
+
+    # проход 1: время тика (без tracemalloc — он сам по себе дорогой)
+    world = scenario.build(seed)
+    _run_ticks(scenario, world, warmup)
+    timings = []
+    done = _run_ticks(scenario, world, ticks, timings)
+
+    ms = sorted(t * 1000.0 for t in timings)
+    result = {
+        "description": scenario.description,
+        "seed": seed,
+        "ticks": done,
+        "mean_ms": (sum(ms) / len(ms)) if ms else 0.0,
+        "p50_ms": _percentile(ms, 0.50),
+        "p99_ms": _percentile(ms, 0.99),
+        "max_ms": ms[-1] if ms else 0.0,
+        "end_enemies": len(world.enemies),
+        "end_projectiles": world.projectiles.count + world.enemy_projectiles.count,
+        "end_particles": world.particles.count,
+        "finished": bool(world.finished),
+        "pools": world.pool_stats(),
+    }
+
+    # проход 2: пик памяти на том же сиде
+    if measure_memory:
+        tracemalloc.start()
+        world = scenario.build(seed)
+        _run_ticks(scenario, world, warmup + done)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mem_kb"] = peak / 1024.0
+
+    return result
+
+
+def compare(old: dict, new: dict):
+    rows = []
+    for name, cur in new.get("scenarios", {}).items():
+        prev = old.get("scenarios", {}).get(name)
+        if prev is None:
+            continue
+        line = [name]
+        for key in ("mean_ms", "p99_ms", "peak_mem_kb"):
+            a = prev.get(key)
+            b = cur.get(key)
+            if a is None or b is None:
+                line.append(key + " n/a")
+                continue
+            delta = ((b - a) / a * 100.0) if a else 0.0
+            line.append(f"{key} {a:.2f} -> {b:.2f} ({delta:+.1f}%)")
+        rows.append("  ".join(line))
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Scenario benchmark for the gameplay tick")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--only", nargs="*", help="имена сценариев")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--ticks", type=int, default=None, help="переопределить число тиков")
+    ap.add_argument("--no-memory", action="store_true", help="не мерить пик памяти (вдвое быстрее)")
+    ap.add_argument("--compare", default=None, help="прошлый JSON для сравнения")
+    ap.add_argument("--list", action="store_true")
+    args = ap.parse_args(argv)
+
+    scenarios = default_scenarios()
+    if args.list:
+        for sc in scenarios:
+            print(f"{sc.name:20s} {sc.ticks:6d}  {sc.description}")
+        return 0
+
+    if args.only:
+        known = {sc.name for sc in scenarios}
+        unknown = [n for n in args.only if n not in known]
+        if unknown:
+            ap.error("unknown scenarios: " + ", ".join(unknown))
+        scenarios = [sc for sc in scenarios if sc.name in args.only]
+
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": {},
+    }
+
+    for sc in scenarios:
+        res = run_scenario(sc, args.seed, args.ticks, measure_memory=not args.no_memory)
+        report["scenarios"][sc.name] = res
+        mem = f"  peak {res['peak_mem_kb']:.0f} KiB" if "peak_mem_kb" in res else ""
+        print(
+            f"{sc.name:20s} ticks {res['ticks']:5d}  mean {res['mean_ms']:7.3f}  p50 {res['p50_ms']:7.3f}"
+            f"  p99 {res['p99_ms']:7.3f}  max {res['max_ms']:7.3f} ms{mem}"
+        )
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+    print("written:", args.out)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        for row in compare(old, report):
+            print(row)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
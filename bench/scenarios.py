@@ -0,0 +1,167 @@
+import math
+
+from core.settings import GameConfig
+from core.world import World
+from core.level_registry import get_level_registry
+
+
+# Игрок в бенчмарках не умирает: меряем стоимость тика, а не исход боя
+BENCH_PLAYER_HP = 10 ** 9
+
+# Враги, которых пули не убивают: их число в сцене не меняется весь прогон
+BENCH_ENEMY_HP = 10 ** 9
+
+
+class Scenario:
+    """Именованный воспроизводимый сценарий: как собрать мир и что делать каждый тик."""
+
+    def __init__(self, name: str, level_id: str, ticks: int, setup=None, per_tick=None, description: str = "",
+                 level_patch=None):
+        self.name = name
+        self.level_id = level_id
+        # поля уровня, подменяемые только в этом сценарии (например, размер арены)
+        self.level_patch = dict(level_patch or {})
+        self.ticks = int(ticks)
+        self.setup = setup
+        self.per_tick = per_tick
+        self.description = description
+
+    def build(self, seed: int, levels=None, cfg=None):
+        levels = levels if levels is not None else get_level_registry().levels
+        cfg = cfg if cfg is not None else GameConfig()
+        index = _level_index(levels, self.level_id)
+        if self.level_patch:
+            levels = list(levels)
+            levels[index] = dict(levels[index], **self.level_patch)
+
+        world = World(cfg, levels, index, seed=seed)
+        world.player.hp = BENCH_PLAYER_HP
+        world.player.max_hp = BENCH_PLAYER_HP
+        world.shooting = True
+        if self.setup is not None:
+            self.setup(world)
+        return world
+
+    def drive(self, world, tick: int):
+        """Скриптованный ввод: игрок ходит по квадрату и водит прицелом по кругу."""
+        phase = (tick // 90) % 4
+        p = world.player
+        p.right = phase == 0
+        p.up = phase == 1
+        p.left = phase == 2
+        p.down = phase == 3
+
+        ang = tick * 0.05
+        world.aim_x = p.x + math.cos(ang) * 300.0
+        world.aim_y = p.y + math.sin(ang) * 300.0
+
+        if self.per_tick is not None:
+            self.per_tick(world, tick)
+
+
+def _level_index(levels, level_id: str) -> int:
+    for i, lvl in enumerate(levels):
+        if lvl.get("id") == level_id:
+            return i
+    raise KeyError("Unknown level id: " + str(level_id))
+
+
+# ------------------------------------------------------------
+# Setup / per-tick helpers
+# ------------------------------------------------------------
+
+def _freeze_waves(world):
+    # волны не идут, а матч не заканчивается: в сцене ровно то, что положили руками
+    world.waves_spawned = world.waves_total
+    world._waiting_next_wave = False
+    world.level_cfg = dict(world.level_cfg, winCondition="none")
+
+
+def _swarm(count: int):
+    def setup(world):
+        _freeze_waves(world)
+        world.spawn_enemies(count)
+    return setup
+
+
+def _tough_swarm(count: int):
+    def setup(world):
+        _freeze_waves(world)
+        world.spawn_enemies(count)
+        for e in world.enemies:
+            e.hp = BENCH_ENEMY_HP
+            e.max_hp = BENCH_ENEMY_HP
+    return setup
+
+
+def _keep_bullets(count: int):
+    def per_tick(world, tick):
+        store = world.projectiles
+        missing = count - store.count
+        if missing <= 0:
+            return
+        rng = world.rng
+        speed = world.cfg.bullet_speed
+        margin = world.tile * 2
+        for _ in range(missing):
+            ang = rng.uniform(0.0, math.tau)
+            store.spawn(
+                rng.uniform(margin, world.arena_w_px - margin),
+                rng.uniform(margin, world.arena_h_px - margin),
+                math.cos(ang) * speed, math.sin(ang) * speed,
+                world.cfg.bullet_radius, world.cfg.bullet_damage, world.cfg.bullet_knockback
+            )
+    return per_tick
+
+
+def _particle_storm(explosions_per_tick: int):
+    def per_tick(world, tick):
+        rng = world.rng
+        for _ in range(explosions_per_tick):
+            world._emit_explosion(
+                rng.uniform(0.0, world.arena_w_px),
+                rng.uniform(0.0, world.arena_h_px)
+            )
+    return per_tick
+
+
+# ------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------
+
+def default_scenarios(levels=None):
+    levels = levels if levels is not None else get_level_registry().levels
+
+    out = []
+    for lvl in levels:
+        waves = int(lvl.get("waves", 3))
+        interval = float(lvl.get("spawnIntervalSeconds", 3.0))
+        # достаточно тиков, чтобы волны успели выйти (60 Гц)
+        ticks = int((waves * interval + 10.0) * 60)
+        out.append(Scenario(
+            "level:" + str(lvl["id"]), lvl["id"], ticks,
+            description="уровень как в игре, обычные волны"
+        ))
+
+    out.extend([
+        Scenario("arena_500", "level_1", 600, setup=_swarm(500),
+                 description="открытая арена, 500 врагов"),
+        Scenario("arena_2000", "level_1", 300, setup=_swarm(2000),
+                 description="открытая арена, 2000 врагов"),
+        Scenario("wide_2000", "level_1", 300, setup=_swarm(2000),
+                 level_patch={"arenaWidth": 120, "arenaHeight": 80, "obstacleDensity": 0.0015},
+                 description="арена 120x80 тайлов, 2000 врагов — большинство вне кадра"),
+        Scenario("generated_arena", "level_1", 300, setup=_swarm(1000),
+                 level_patch={"arenaWidth": 120, "arenaHeight": 80, "seed": 7, "obstacleDensity": 0.08},
+                 description="сгенерированная арена 120x80, плотность 0.08, 1000 врагов"),
+        Scenario("bullets_5000", "level_1", 600, setup=_freeze_waves, per_tick=_keep_bullets(5000),
+                 description="5000 живых пуль игрока"),
+        Scenario("bullets_enemies", "level_1", 600, setup=_tough_swarm(1000), per_tick=_keep_bullets(5000),
+                 level_patch={"arenaWidth": 120, "arenaHeight": 80, "obstacleDensity": 0.0015},
+                 description="5000 пуль игрока и 1000 неубиваемых врагов на арене 120x80 — попадания каждый тик"),
+        Scenario("particle_storm", "level_1", 600, setup=_freeze_waves, per_tick=_particle_storm(20),
+                 description="20 взрывов за тик"),
+        Scenario("maze_swarm", "level_2", 600, setup=_swarm(400),
+                 description="лабиринт, 400 врагов"),
+    ])
+    return out
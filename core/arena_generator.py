@@ -0,0 +1,147 @@
+import math
+import random
+from collections import deque
+
+
+# доля площади арены под препятствиями, если в уровне не задано obstacleDensity
+DEFAULT_DENSITY = 0.02
+
+# стороны препятствия в тайлах
+MIN_SIZE = 0.7
+MAX_SIZE = 1.8
+
+# свободный коридор между препятствиями (в тайлах) — чтобы любое тело прошло
+GAP = 1.0
+
+# от края арены до центра препятствия (в тайлах)
+BORDER_MARGIN = 2.0
+
+# вокруг точки появления игрока ничего не ставим (в тайлах)
+SPAWN_CLEAR = 3.0
+
+# сколько неудачных бросков подряд — и считаем, что места больше нет
+MAX_MISSES = 200
+
+
+def generate_obstacles(width: float, height: float, tile: float, seed, density: float = DEFAULT_DENSITY,
+                       spawn=None):
+    """Случайные препятствия (cx, cy, w, h) на арене width x height; один seed — одна раскладка."""
+    rng = random.Random(seed)
+    if spawn is None:
+        spawn = (width / 2, height / 2)
+    sx, sy = spawn
+
+    lo_x = tile * BORDER_MARGIN
+    hi_x = width - tile * BORDER_MARGIN
+    lo_y = tile * BORDER_MARGIN
+    hi_y = height - tile * BORDER_MARGIN
+    if hi_x <= lo_x or hi_y <= lo_y or density <= 0:
+        return []
+
+    gap = tile * GAP
+    clear = tile * SPAWN_CLEAR
+    min_s = tile * MIN_SIZE
+    max_s = tile * MAX_SIZE
+
+    # клетка сетки не меньше препятствия с зазором — пересечься можно только с соседями 3x3
+    cell = max_s + gap
+    buckets = {}
+
+    target_area = density * width * height
+    area = 0.0
+    rects = []
+    misses = 0
+
+    while area < target_area and misses < MAX_MISSES:
+        x = rng.uniform(lo_x, hi_x)
+        y = rng.uniform(lo_y, hi_y)
+        w = rng.uniform(min_s, max_s)
+        h = rng.uniform(min_s, max_s)
+
+        # ближайшая к спауну точка прямоугольника
+        nx = min(max(sx, x - w / 2), x + w / 2)
+        ny = min(max(sy, y - h / 2), y + h / 2)
+        if (nx - sx) ** 2 + (ny - sy) ** 2 < clear * clear:
+            misses += 1
+            continue
+
+        gx = int(x // cell)
+        gy = int(y // cell)
+        hit = False
+        for bx in (gx - 1, gx, gx + 1):
+            for by in (gy - 1, gy, gy + 1):
+                for i in buckets.get((bx, by), ()):
+                    ox, oy, ow, oh = rects[i]
+                    if abs(x - ox) * 2 < w + ow + gap * 2 and abs(y - oy) * 2 < h + oh + gap * 2:
+                        hit = True
+                        break
+                if hit:
+                    break
+            if hit:
+                break
+        if hit:
+            misses += 1
+            continue
+
+        misses = 0
+        buckets.setdefault((gx, gy), []).append(len(rects))
+        rects.append((x, y, w, h))
+        area += w * h
+
+    return _ensure_connected(rects, width, height, tile, spawn)
+
+
+def _ensure_connected(rects, width, height, tile, spawn):
+    """Убрать препятствия, пока все свободные тайлы не станут достижимы от спауна."""
+    cols = max(1, int(math.ceil(width / tile)))
+    rows = max(1, int(math.ceil(height / tile)))
+    start_c = min(cols - 1, max(0, int(spawn[0] // tile)))
+    start_r = min(rows - 1, max(0, int(spawn[1] // tile)))
+
+    alive = [True] * len(rects)
+    spans = []
+    for (x, y, w, h) in rects:
+        spans.append((
+            max(0, int(math.floor((x - w / 2) / tile))), min(cols, int(math.ceil((x + w / 2) / tile))),
+            max(0, int(math.floor((y - h / 2) / tile))), min(rows, int(math.ceil((y + h / 2) / tile))),
+        ))
+
+    while True:
+        # владелец закрытого тайла: индекс препятствия, -1 — свободно
+        owner = [-1] * (rows * cols)
+        for i, (c0, c1, r0, r1) in enumerate(spans):
+            if not alive[i]:
+                continue
+            for r in range(r0, r1):
+                base = r * cols
+                for c in range(c0, c1):
+                    owner[base + c] = i
+
+        start = start_r * cols + start_c
+        seen = bytearray(rows * cols)
+        seen[start] = 1
+        queue = deque([start])
+        while queue:
+            k = queue.popleft()
+            r, c = divmod(k, cols)
+            for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                if 0 <= nr < rows and 0 <= nc < cols:
+                    n = nr * cols + nc
+                    if not seen[n] and owner[n] < 0:
+                        seen[n] = 1
+                        queue.append(n)
+
+        cut = set()
+        for k in range(rows * cols):
+            if seen[k] or owner[k] >= 0:
+                continue
+            r, c = divmod(k, cols)
+            for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                if 0 <= nr < rows and 0 <= nc < cols and owner[nr * cols + nc] >= 0:
+                    cut.add(owner[nr * cols + nc])
+        if not cut:
+            break
+        for i in cut:
+            alive[i] = False
+
+    return [r for r, ok in zip(rects, alive) if ok]
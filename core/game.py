@@ -18,7 +18,7 @@ class Game(arcade.Window):
             self.cfg.screen_height,
             self.cfg.title,
             resizable=False,
-            update_rate=1 / 120
+            update_rate=self.cfg.update_rate
         )
 
         arcade.set_background_color(arcade.color.BLACK)
@@ -0,0 +1,427 @@
+import hashlib
+import json
+import os
+import re
+
+from core.arena_generator import DEFAULT_DENSITY, generate_obstacles
+from systems.aabb import AABB
+from systems.spawn_index import SpawnIndex
+from systems.wall_index import WallIndex
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+LEVELS_PATH = os.path.join(DATA_DIR, "levels.json")
+# скомпилированные уровни; ключ — хэш levels.json + размер тайла + версия формата
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", ".level_cache")
+
+# меняется при любой правке compile_level — старый кэш тогда просто не найдётся
+PACK_VERSION = 3
+
+ENEMY_TYPES = ("melee", "shooter", "charger", "tank")
+WIN_CONDITIONS = ("kill_all_after_waves", "none")
+
+# толщина стен по краю арены
+BORDER_THICKNESS = 60
+
+# отступы зон спауна врагов (в тайлах): от края арены и от стен кольца
+SPAWN_BORDER = 2.0
+SPAWN_RING_MARGIN = 0.8
+
+LAYOUTS = ("open", "ring")
+
+# символы tileMap: стена и пол
+WALL_CHAR = "#"
+FLOOR_CHAR = "."
+
+_RLE_TOKEN = re.compile(r"(\d*)(\D)")
+
+
+class LevelError(ValueError):
+    """Описание уровня в levels.json не проходит проверку."""
+
+
+# ------------------------------------------------------------
+# Validation
+# ------------------------------------------------------------
+
+def _is_number(v) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def decode_tile_map(tile_map):
+    """Строки карты сверху вниз из tileMap: список строк или {"encoding": "rle" | "ascii", "rows": [...]}."""
+    encoding = "ascii"
+    rows = tile_map
+    if isinstance(tile_map, dict):
+        encoding = tile_map.get("encoding", "ascii")
+        rows = tile_map.get("rows")
+        if encoding not in ("ascii", "rle"):
+            raise LevelError("tileMap: unknown encoding " + repr(encoding))
+    if not isinstance(rows, list) or not rows or not all(isinstance(r, str) for r in rows):
+        raise LevelError("tileMap: rows must be a non-empty list of strings")
+    if encoding == "ascii":
+        return list(rows)
+
+    out = []
+    for r in rows:
+        parts = []
+        pos = 0
+        for m in _RLE_TOKEN.finditer(r):
+            if m.start() != pos:
+                break
+            parts.append(m.group(2) * (int(m.group(1)) if m.group(1) else 1))
+            pos = m.end()
+        if pos != len(r):
+            raise LevelError("tileMap: bad RLE row " + repr(r))
+        out.append("".join(parts))
+    return out
+
+
+def validate_level(lvl, index: int = 0):
+    """Проверить одно описание уровня; LevelError с понятным текстом, если что-то не так."""
+    where = "level #" + str(index)
+    if not isinstance(lvl, dict):
+        raise LevelError(where + ": expected an object")
+    if "id" in lvl:
+        where = "level " + repr(lvl["id"])
+
+    def need(key, check, what):
+        if key not in lvl:
+            raise LevelError(where + ": missing '" + key + "'")
+        if not check(lvl[key]):
+            raise LevelError(where + ": '" + key + "' must be " + what)
+
+    need("id", lambda v: isinstance(v, str) and v != "", "a non-empty string")
+    need("name", lambda v: isinstance(v, str), "a string")
+    need("arenaWidth", lambda v: isinstance(v, int) and not isinstance(v, bool) and v > 0, "a positive integer")
+    need("arenaHeight", lambda v: isinstance(v, int) and not isinstance(v, bool) and v > 0, "a positive integer")
+
+    if "waves" in lvl and not (isinstance(lvl["waves"], int) and not isinstance(lvl["waves"], bool) and lvl["waves"] >= 0):
+        raise LevelError(where + ": 'waves' must be a non-negative integer")
+    if "spawnIntervalSeconds" in lvl and not (_is_number(lvl["spawnIntervalSeconds"]) and lvl["spawnIntervalSeconds"] > 0):
+        raise LevelError(where + ": 'spawnIntervalSeconds' must be a positive number")
+    if "winCondition" in lvl and lvl["winCondition"] not in WIN_CONDITIONS:
+        raise LevelError(where + ": unknown winCondition " + repr(lvl["winCondition"]))
+
+    if "layout" in lvl and lvl["layout"] not in LAYOUTS:
+        raise LevelError(where + ": unknown layout " + repr(lvl["layout"]))
+    if "tileMap" in lvl:
+        if lvl.get("layout", "open") != "open":
+            raise LevelError(where + ": 'tileMap' and layout " + repr(lvl["layout"]) + " are exclusive")
+        try:
+            rows = decode_tile_map(lvl["tileMap"])
+        except LevelError as e:
+            raise LevelError(where + ": " + str(e)) from None
+        cols = len(rows[0])
+        for r in rows:
+            if len(r) != cols:
+                raise LevelError(where + ": tileMap rows must all have the same length")
+            bad = set(r) - {WALL_CHAR, FLOOR_CHAR}
+            if bad:
+                raise LevelError(where + ": tileMap has unknown tiles " + repr("".join(sorted(bad))))
+        if cols > lvl["arenaWidth"] or len(rows) > lvl["arenaHeight"]:
+            raise LevelError(where + ": tileMap is larger than the arena")
+        if not any(FLOOR_CHAR in r for r in rows):
+            raise LevelError(where + ": tileMap has no floor tiles")
+
+    if "seed" in lvl or "obstacleDensity" in lvl:
+        if "tileMap" in lvl or lvl.get("layout", "open") != "open":
+            raise LevelError(where + ": 'seed' and 'obstacleDensity' apply only to open arenas")
+    if "seed" in lvl and not (isinstance(lvl["seed"], int) and not isinstance(lvl["seed"], bool)):
+        raise LevelError(where + ": 'seed' must be an integer")
+    if "obstacleDensity" in lvl and not (_is_number(lvl["obstacleDensity"]) and 0 <= lvl["obstacleDensity"] <= 0.5):
+        raise LevelError(where + ": 'obstacleDensity' must be a number in [0, 0.5]")
+
+    types = lvl.get("enemyTypes", ["melee"])
+    if not isinstance(types, list) or not types:
+        raise LevelError(where + ": 'enemyTypes' must be a non-empty list")
+    for et in types:
+        if et not in ENEMY_TYPES:
+            raise LevelError(where + ": unknown enemy type " + repr(et))
+
+    stats = lvl.get("enemyStats", {})
+    if not isinstance(stats, dict):
+        raise LevelError(where + ": 'enemyStats' must be an object")
+    for et, st in stats.items():
+        if et not in ENEMY_TYPES:
+            raise LevelError(where + ": enemyStats for unknown type " + repr(et))
+        if not isinstance(st, dict):
+            raise LevelError(where + ": enemyStats." + et + " must be an object")
+        if "hp" in st and not (_is_number(st["hp"]) and st["hp"] > 0):
+            raise LevelError(where + ": enemyStats." + et + ".hp must be positive")
+        if "speed" in st and not (_is_number(st["speed"]) and st["speed"] >= 0):
+            raise LevelError(where + ": enemyStats." + et + ".speed must be non-negative")
+
+
+def validate_levels(levels):
+    if not isinstance(levels, list) or not levels:
+        raise LevelError("levels file must contain a non-empty list")
+    seen = set()
+    for i, lvl in enumerate(levels):
+        validate_level(lvl, i)
+        if lvl["id"] in seen:
+            raise LevelError("duplicate level id " + repr(lvl["id"]))
+        seen.add(lvl["id"])
+
+
+# ------------------------------------------------------------
+# Compiled pack
+# ------------------------------------------------------------
+
+class LevelPack:
+    """Готовая раскладка уровня ("maze", "ring" или "open"): границы, стены и данные для спауна."""
+
+    def __init__(self, level_id: str, kind: str, arena_w_px: int, arena_h_px: int, walls,
+                 floor_points=(), grid=None, grid_origin=(0.0, 0.0), ring=None, density=None):
+        self.level_id = level_id
+        self.kind = kind
+        self.arena_w_px = int(arena_w_px)
+        self.arena_h_px = int(arena_h_px)
+        self.walls = [tuple(w) for w in walls]  # (cx, cy, w, h)
+        self.floor_points = [tuple(p) for p in floor_points]
+        self.grid = list(grid) if grid is not None else None
+        self.grid_origin = tuple(grid_origin)
+        self.ring = tuple(ring) if ring is not None else None  # (cx, cy, w, h)
+        # None — раскладка полностью в walls
+        self.density = density
+        self._wall_index = None
+        self._spawn_index = None
+
+    def make_walls(self):
+        return [AABB(*w) for w in self.walls]
+
+    def wall_index(self, cell_size: float):
+        """Индекс только статических стен пакета; строится один раз и делится между мирами."""
+        if self._wall_index is None or self._wall_index.cell_size != float(cell_size):
+            self._wall_index = WallIndex(self.make_walls(), cell_size)
+        return self._wall_index
+
+    def spawn_index(self, tile: float, radii, wall_index=None) -> SpawnIndex:
+        """Точки спауна врагов; со своим wall_index (сгенерированные препятствия) строятся заново."""
+        own = wall_index is None
+        if own and self._spawn_index is not None and self._spawn_index.radii == sorted(set(float(r) for r in radii)):
+            return self._spawn_index
+        if own:
+            wall_index = self.wall_index(tile)
+
+        if self.kind == "maze":
+            index = SpawnIndex.from_points(self.floor_points, radii, wall_index)
+        elif self.kind == "ring":
+            cx, cy, rw, rh = self.ring
+            m = tile * SPAWN_RING_MARGIN
+            index = SpawnIndex.grid(cx - rw / 2 + m, cy - rh / 2 + m, cx + rw / 2 - m, cy + rh / 2 - m,
+                                    tile / 2, radii, wall_index)
+        else:
+            m = tile * SPAWN_BORDER
+            index = SpawnIndex.grid(m, m, self.arena_w_px - m, self.arena_h_px - m, tile / 2, radii, wall_index)
+
+        if own:
+            self._spawn_index = index
+        return index
+
+    def to_dict(self):
+        return {
+            "level_id": self.level_id,
+            "kind": self.kind,
+            "arena_w_px": self.arena_w_px,
+            "arena_h_px": self.arena_h_px,
+            "walls": self.walls,
+            "floor_points": self.floor_points,
+            "grid": self.grid,
+            "grid_origin": self.grid_origin,
+            "ring": self.ring,
+            "density": self.density,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d["level_id"], d["kind"], d["arena_w_px"], d["arena_h_px"], d["walls"],
+            d.get("floor_points", ()), d.get("grid"), d.get("grid_origin", (0.0, 0.0)), d.get("ring"),
+            d.get("density")
+        )
+
+
+def greedy_rectangles(grid, char: str = WALL_CHAR):
+    """Покрыть клетки char прямоугольниками (col, row, w, h) без наложений, жадно."""
+    by_rows = _greedy_pass(grid, char)
+    columns = ["".join(col) for col in zip(*grid)] if grid else []
+    by_cols = [(y, x, h, w) for (x, y, w, h) in _greedy_pass(columns, char)]
+    return by_cols if len(by_cols) < len(by_rows) else by_rows
+
+
+def _greedy_pass(grid, char):
+    rows = len(grid)
+    cols = len(grid[0]) if rows > 0 else 0
+    used = [[False] * cols for _ in range(rows)]
+    out = []
+    for y in range(rows):
+        row = grid[y]
+        for x in range(cols):
+            if row[x] != char or used[y][x]:
+                continue
+            w = 1
+            while x + w < cols and row[x + w] == char and not used[y][x + w]:
+                w += 1
+            h = 1
+            while y + h < rows and all(grid[y + h][i] == char and not used[y + h][i] for i in range(x, x + w)):
+                h += 1
+            for yy in range(y, y + h):
+                used_row = used[yy]
+                for i in range(x, x + w):
+                    used_row[i] = True
+            out.append((x, y, w, h))
+    return out
+
+
+def _compile_grid(grid, cell, arena_w_px, arena_h_px):
+    """Стены и центры клеток пола карты, отцентрованной в арене (строка 0 — нижняя)."""
+    rows = len(grid)
+    cols = len(grid[0]) if rows > 0 else 0
+    x_offset = (arena_w_px - cols * cell) / 2
+    y_offset = (arena_h_px - rows * cell) / 2
+
+    walls = []
+    for (x, y, w, h) in greedy_rectangles(grid):
+        walls.append((x_offset + (x + w / 2) * cell, y_offset + (y + h / 2) * cell, w * cell, h * cell))
+
+    floors = []
+    for y in range(rows):
+        row = grid[y]
+        for x in range(cols):
+            if row[x] == FLOOR_CHAR:
+                floors.append((x_offset + x * cell + cell / 2, y_offset + y * cell + cell / 2))
+    return walls, floors, (x_offset, y_offset)
+
+
+def compile_level(lvl, tile: int) -> LevelPack:
+    arena_w = int(lvl["arenaWidth"]) * tile
+    arena_h = int(lvl["arenaHeight"]) * tile
+
+    t = BORDER_THICKNESS
+    walls = [
+        (arena_w / 2, -t / 2, arena_w, t),
+        (arena_w / 2, arena_h + t / 2, arena_w, t),
+        (-t / 2, arena_h / 2, t, arena_h),
+        (arena_w + t / 2, arena_h / 2, t, arena_h),
+    ]
+
+    if "tileMap" in lvl:
+        # в JSON строки идут сверху вниз, в мире строка 0 — нижняя
+        grid = decode_tile_map(lvl["tileMap"])[::-1]
+        map_walls, floors, origin = _compile_grid(grid, tile, arena_w, arena_h)
+        walls.extend(map_walls)
+        return LevelPack(lvl["id"], "maze", arena_w, arena_h, walls, floors, grid, origin)
+
+    if lvl.get("layout", "open") == "ring":
+        cx = arena_w / 2
+        cy = arena_h / 2
+        rw = arena_w * 0.55
+        rh = arena_h * 0.55
+        seg = tile * 0.9
+        walls.append((cx, cy + rh / 2, rw, seg))
+        walls.append((cx, cy - rh / 2, rw, seg))
+        walls.append((cx - rw / 2, cy, seg, rh))
+        walls.append((cx + rw / 2, cy, seg, rh))
+        return LevelPack(lvl["id"], "ring", arena_w, arena_h, walls, ring=(cx, cy, rw, rh))
+
+    density = float(lvl.get("obstacleDensity", DEFAULT_DENSITY))
+    if "seed" not in lvl:
+        return LevelPack(lvl["id"], "open", arena_w, arena_h, walls, density=density)
+    walls.extend(generate_obstacles(arena_w, arena_h, tile, lvl["seed"], density))
+    return LevelPack(lvl["id"], "open", arena_w, arena_h, walls)
+
+
+def _content_key(lvl) -> str:
+    return hashlib.sha1(json.dumps(lvl, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+# ------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------
+
+class LevelRegistry:
+    """Один на процесс: уровни проверяются и компилируются в пакеты раз, с дисковым кэшем."""
+
+    def __init__(self, path: str = LEVELS_PATH, tile_size: int = 64, cache_dir: str = CACHE_DIR):
+        self.path = path
+        self.tile = int(tile_size)
+        self.cache_dir = cache_dir
+        self.levels = []
+        self.file_hash = ""
+        self.cache_hit = False
+        self._packs = {}
+        self.reload()
+
+    def __len__(self):
+        return len(self.levels)
+
+    @property
+    def cache_path(self) -> str:
+        return os.path.join(self.cache_dir, f"levels-{self.file_hash}-t{self.tile}-v{PACK_VERSION}.json")
+
+    def reload(self):
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        levels = json.loads(raw.decode("utf-8"))
+        validate_levels(levels)
+
+        self.levels = levels
+        self.file_hash = hashlib.sha1(raw).hexdigest()[:16]
+        self._packs = {}
+
+        keys = [_content_key(lvl) for lvl in levels]
+        cached = self._read_cache(keys)
+        self.cache_hit = cached is not None
+        if self.cache_hit:
+            self._packs = cached
+            return
+
+        for k, lvl in zip(keys, levels):
+            self._packs[k] = compile_level(lvl, self.tile)
+        self._write_cache()
+
+    def _read_cache(self, keys):
+        """Паки всех уровней из кэша или None — если файла нет, он битый или в нём не всё."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            return {k: LevelPack.from_dict(cached[k]) for k in keys}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_cache(self):
+        # кэш — только ускорение: не получилось записать, значит не получилось
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({k: p.to_dict() for k, p in self._packs.items()}, f, ensure_ascii=False)
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass
+
+    def pack(self, index: int) -> LevelPack:
+        return self.pack_for(self.levels[index])
+
+    def pack_for(self, lvl) -> LevelPack:
+        key = _content_key(lvl)
+        pack = self._packs.get(key)
+        if pack is None:
+            validate_level(lvl)
+            pack = compile_level(lvl, self.tile)
+            self._packs[key] = pack
+        return pack
+
+
+_registries = {}
+
+
+def get_level_registry(tile_size: int = 64, path: str = LEVELS_PATH) -> LevelRegistry:
+    """Общий на процесс реестр для данного файла и размера тайла."""
+    key = (os.path.abspath(path), int(tile_size))
+    reg = _registries.get(key)
+    if reg is None:
+        reg = LevelRegistry(path, tile_size)
+        _registries[key] = reg
+    return reg
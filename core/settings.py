@@ -5,6 +5,13 @@ class GameConfig:
         self.title = "Top-Down Shooter (Arcade)"
         self.tile_size = 64
 
+        # как часто окно вызывает on_update
+        self.update_rate = 1 / 60
+        # шаг симуляции (фиксированный, не зависит от частоты кадров); пули
+        # проверяются по отрезку пути, поэтому точность сохраняется и на 60/30 Гц
+        self.fixed_timestep = 1 / 60
+        self.max_steps_per_frame = 5
+
         self.player_radius = 18
         self.player_speed = 280
         self.player_hp = 100
@@ -16,3 +23,30 @@ class GameConfig:
 
         self.contact_damage = 10
         self.contact_damage_interval = 0.5
+
+        self.particle_capacity = 4096
+        self.particle_evict_policy = "oldest"  # "oldest" | "lowest_ttl"
+
+        # планировщик ИИ: враги в кадре камеры (с запасом) и рядом с игроком
+        # думают каждый тик, дальние — раз в ai_mid_period / ai_far_period
+        # тиков, а между этим едут по инерции
+        self.ai_near_radius = 600.0
+        self.ai_view_margin = 128.0
+        self.ai_far_radius = 1800.0
+        self.ai_mid_period = 3
+        self.ai_far_period = 8
+        self.ai_budget_ms = 2.0  # сколько за тик можно потратить на дальних
+        # сколько клеток поля путей пересчитывать за тик, когда игрок сменил клетку
+        self.flow_cells_per_tick = 1000
+        # как часто стрелки перепроверяют, видят ли игрока
+        self.los_refresh = 0.15
+
+        # не рисовать полоски HP у врагов с полным здоровьем
+        self.hp_bar_hide_full = False
+
+        # миникарта в правом нижнем углу (M — показать/скрыть)
+        self.minimap_width = 240
+
+        # профайлер кадра (F3 — оверлей, F4 — запись в CSV)
+        self.profiler_history = 240
+        self.profiler_csv_path = "profile.csv"
@@ -0,0 +1,746 @@
+import random
+import math
+import time
+
+import numpy as np
+
+from systems.aabb import AABB
+from systems.collision_system import circle_circle_hit, circle_aabb_hit, soft_separate_circles
+from systems.score_system import ScoreSystem
+from systems.wall_index import WallIndex
+from systems.projectile_system import ProjectileStore, circle_arrays
+from systems.particle_system import ParticleSystem
+from systems.steering_system import circles_blocked, step_enemies
+from systems.ai_system import AIScheduler, FlowField, LineOfSight
+from systems.profiler import FrameProfiler
+from systems.pool import ObjectPool
+from systems.entity_list import EntityList
+from core.arena_generator import generate_obstacles
+from core.level_registry import get_level_registry
+from systems.spatial_hash import (
+    SpatialHash, LAYER_ENEMY, PLAYER_KEY
+)
+
+from entities.player import Player
+from entities.enemy import ENEMY_BULLET_RADIUS, Enemy
+
+
+ENEMY_RADIUS = {"melee": 16, "shooter": 16, "charger": 18, "tank": 24}
+ENEMY_MASS = {"tank": 3.0}
+
+# враги появляются не ближе стольких тайлов к игроку
+SPAWN_MIN_DIST = 3.0
+
+# Цвета искр (RGB) — без зависимости от arcade
+HIT_SPARK_COLOR = (255, 165, 0)
+EXPLOSION_COLOR = (255, 174, 66)
+
+
+class _SilentAudio:
+    def play_shot(self):
+        pass
+
+    def play_hit(self):
+        pass
+
+    def play_explosion(self):
+        pass
+
+
+class World:
+    """Вся игровая логика матча без окна: сцена передаёт ввод и рисует состояние."""
+
+    def __init__(self, cfg, levels, level_index: int = 0, campaign_mode: bool = False,
+                 audio=None, seed=None, profiler=None, registry=None):
+        self.cfg = cfg
+        self.levels = levels
+        # готовые раскладки уровней общие для всех миров процесса
+        self.registry = registry if registry is not None else get_level_registry(cfg.tile_size)
+        self.campaign_mode = bool(campaign_mode)
+        self.audio = audio if audio is not None else _SilentAudio()
+
+        self.rng = random.Random(seed)
+        # замеры по этапам тика (выключен — почти бесплатен)
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+
+        self.level_index = int(level_index)
+        if self.level_index < 0:
+            self.level_index = 0
+        if self.level_index >= len(self.levels):
+            self.level_index = 0
+        self.level_cfg = self.levels[self.level_index]
+
+        self.tile = int(self.cfg.tile_size)
+        self.arena_w_px = int(self.level_cfg["arenaWidth"]) * self.tile
+        self.arena_h_px = int(self.level_cfg["arenaHeight"]) * self.tile
+
+        self.player = Player(
+            x=self.arena_w_px / 2,
+            y=self.arena_h_px / 2,
+            radius=self.cfg.player_radius,
+            speed=self.cfg.player_speed,
+            hp=self.cfg.player_hp
+        )
+        self._player_hp_start = int(self.player.hp)
+
+        self.enemies = EntityList()
+        # убитые враги переиспользуются, а не отдаются сборщику мусора
+        self.enemy_pool = ObjectPool(Enemy)
+        self.projectiles = ProjectileStore()
+        self.enemy_projectiles = ProjectileStore()
+        self.particles = ParticleSystem(
+            self.cfg.particle_capacity, self.cfg.particle_evict_policy,
+            rng=np.random.default_rng(seed)
+        )
+
+        # broadphase для всех пересечений круг-круг, пересобирается раз в тик
+        self.spatial_hash = SpatialHash(self.cfg.tile_size)
+
+        # кто из врагов думает в этот тик, а кто едет по инерции
+        self.ai = AIScheduler.from_config(self.cfg)
+        # стрелки не тратят пули на стены
+        self.los = LineOfSight(self.cfg.los_refresh, pad=ENEMY_BULLET_RADIUS, types=("shooter",))
+
+        # ✅ контактный урон игрока (по врагам)
+        self.player_contact_damage = getattr(self.cfg, "player_contact_damage", 8)
+
+        # Waves
+        self.waves_total = int(self.level_cfg.get("waves", 3))
+        self.spawn_interval = float(self.level_cfg.get("spawnIntervalSeconds", 3.0))
+        self.enemy_types = list(self.level_cfg.get("enemyTypes", ["melee"]))
+        self.enemy_stats = dict(self.level_cfg.get("enemyStats", {}))
+
+        self.waves_spawned = 0
+        self._wave_wait_timer = 0.25
+        self._waiting_next_wave = True
+        self._just_cleared = False
+
+        self.score = ScoreSystem()
+
+        # Maze
+        self.maze_is_active = False
+        self.maze_floor_points = []
+
+        # Ring
+        self.ring_is_active = False
+        self._ring_cx = 0.0
+        self._ring_cy = 0.0
+        self._ring_w = 0.0
+        self._ring_h = 0.0
+
+        # Results stats (копим по всей кампании тоже)
+        self.time_seconds = 0.0
+        self.shots_fired = 0
+        self.shots_hit = 0
+        self.kills_total = 0
+        self.kills_by_type = {}
+
+        self.wall_index = None
+        self.spawn_index = None
+        self.flow_field = None
+        self.walls = self._build_walls_for_level()
+        # растёт при каждой смене уровня — по нему рендер понимает, что уровень новый
+        self.level_generation = 0
+
+        self._place_player_safe()
+        self.player.save_prev()
+
+        # ввод
+        self.shooting = False
+        self.aim_x = float(self.player.x)
+        self.aim_y = float(self.player.y)
+
+        self._contact_timer = 0.0
+        self._level_intro_timer = 0.8
+
+        # фиксированный шаг симуляции
+        self.fixed_dt = float(self.cfg.fixed_timestep)
+        self.max_steps = int(self.cfg.max_steps_per_frame)
+        self.accumulator = 0.0
+
+        # итог матча
+        self.finished = False
+        self.victory = False
+
+    # ------------------------------------------------------------
+    # Anti-push into walls
+    # ------------------------------------------------------------
+
+    def _push_circle_out_of_walls(self, x: float, y: float, r: float, wall_index):
+        moved_any = False
+        for _ in range(8):
+            moved_this_iter = False
+
+            for w in wall_index.near(x, y, r * 2):
+                if not circle_aabb_hit(x, y, r, w):
+                    continue
+
+                l = w.left()
+                rr = w.right()
+                b = w.bottom()
+                t = w.top()
+
+                px = min(max(x, l), rr)
+                py = min(max(y, b), t)
+
+                dx = x - px
+                dy = y - py
+                dist2 = dx * dx + dy * dy
+
+                if dist2 > 1e-9:
+                    dist = math.sqrt(dist2)
+                    pen = r - dist
+                    if pen > 0:
+                        nx = dx / dist
+                        ny = dy / dist
+                        x += nx * (pen + 0.5)
+                        y += ny * (pen + 0.5)
+                        moved_this_iter = True
+                        moved_any = True
+                else:
+                    left_pen = (x - l)
+                    right_pen = (rr - x)
+                    bottom_pen = (y - b)
+                    top_pen = (t - y)
+
+                    m = min(left_pen, right_pen, bottom_pen, top_pen)
+
+                    if m == left_pen:
+                        x = l - r - 0.5
+                    elif m == right_pen:
+                        x = rr + r + 0.5
+                    elif m == bottom_pen:
+                        y = b - r - 0.5
+                    else:
+                        y = t + r + 0.5
+
+                    moved_this_iter = True
+                    moved_any = True
+
+            if not moved_this_iter:
+                break
+
+        return x, y, moved_any
+
+    def _unstick_coasted(self, think, elapsed, dt: float):
+        # по инерции стены не проверяются: кто заехал в стену — выталкиваем
+        coasted = [e for e, t in zip(think, elapsed.tolist()) if t > dt * 1.5]
+        if not coasted:
+            return
+        xs, ys, rs = circle_arrays(coasted)
+        for e, hit in zip(coasted, circles_blocked(xs, ys, rs, self.wall_index).tolist()):
+            if hit:
+                e.x, e.y, _ = self._push_circle_out_of_walls(e.x, e.y, e.radius, self.wall_index)
+
+    def _separate_bodies(self, grid):
+        """Раздвинуть игрока и врагов — те же пары и в том же порядке, что полный перебор."""
+        p = self.player
+        enemies = self.enemies
+
+        # игрок-враг
+        pr = p.radius
+        qx, qy = p.x, p.y
+        cand = grid.query(qx, qy, pr * 2, LAYER_ENEMY)
+        k = 0
+        while k < len(cand):
+            i = cand[k]
+            k += 1
+            e = enemies[i]
+            if not circle_circle_hit(p.x, p.y, pr, e.x, e.y, e.radius):
+                continue
+            p.x, p.y, e.x, e.y = soft_separate_circles(p.x, p.y, pr, e.x, e.y, e.radius)
+            grid.move(i, e.x, e.y)
+            if (p.x - qx) ** 2 + (p.y - qy) ** 2 > pr * pr:
+                qx, qy = p.x, p.y
+                cand = [j for j in grid.query(qx, qy, pr * 2, LAYER_ENEMY) if j > i]
+                k = 0
+        grid.move(PLAYER_KEY, p.x, p.y)
+
+        # враг-враг
+        for i, a in enumerate(enemies):
+            ar = a.radius
+            qx, qy = a.x, a.y
+            cand = grid.query(qx, qy, ar * 2, LAYER_ENEMY)
+            k = 0
+            while k < len(cand):
+                j = cand[k]
+                k += 1
+                if j <= i:
+                    continue
+                b = enemies[j]
+                if not circle_circle_hit(a.x, a.y, ar, b.x, b.y, b.radius):
+                    continue
+                a.x, a.y, b.x, b.y = soft_separate_circles(a.x, a.y, ar, b.x, b.y, b.radius)
+                grid.move(i, a.x, a.y)
+                grid.move(j, b.x, b.y)
+                if (a.x - qx) ** 2 + (a.y - qy) ** 2 > ar * ar:
+                    qx, qy = a.x, a.y
+                    cand = [c for c in grid.query(qx, qy, ar * 2, LAYER_ENEMY) if c > j]
+                    k = 0
+
+    def _player_post_physics_fix(self, prev_x: float, prev_y: float):
+        x, y, _ = self._push_circle_out_of_walls(self.player.x, self.player.y, self.player.radius, self.wall_index)
+        self.player.x = x
+        self.player.y = y
+
+        if self.wall_index.circle_hit(self.player.x, self.player.y, self.player.radius):
+            self.player.x = prev_x
+            self.player.y = prev_y
+            x2, y2, _ = self._push_circle_out_of_walls(self.player.x, self.player.y, self.player.radius, self.wall_index)
+            self.player.x = x2
+            self.player.y = y2
+
+    # ------------------------------------------------------------
+    # Level loading (for Campaign)
+    # ------------------------------------------------------------
+
+    def _apply_level_cfg(self, level_index: int):
+        self.level_index = int(level_index)
+        if self.level_index < 0:
+            self.level_index = 0
+        if self.level_index >= len(self.levels):
+            self.level_index = 0
+
+        self.level_cfg = self.levels[self.level_index]
+
+        self.arena_w_px = int(self.level_cfg["arenaWidth"]) * self.tile
+        self.arena_h_px = int(self.level_cfg["arenaHeight"]) * self.tile
+
+        self.waves_total = int(self.level_cfg.get("waves", 3))
+        self.spawn_interval = float(self.level_cfg.get("spawnIntervalSeconds", 3.0))
+        self.enemy_types = list(self.level_cfg.get("enemyTypes", ["melee"]))
+        self.enemy_stats = dict(self.level_cfg.get("enemyStats", {}))
+
+        self.waves_spawned = 0
+        self._wave_wait_timer = 0.25
+        self._waiting_next_wave = True
+        self._just_cleared = False
+
+        self.enemy_pool.release_all(self.enemies.clear())
+        self.projectiles.clear()
+        self.enemy_projectiles.clear()
+        self.particles.clear()
+
+        self.walls = self._build_walls_for_level()
+        self.level_generation += 1
+
+        self._place_player_safe()
+        # после телепорта на новый уровень не тянем картинку из старой позиции
+        self.player.save_prev()
+        self.accumulator = 0.0
+        self._level_intro_timer = 0.8
+
+    def _advance_campaign_or_finish(self):
+        # ✅ если кампанию включили — идём дальше по списку уровней
+        if not self.campaign_mode:
+            self._finish(True)
+            return
+
+        next_index = self.level_index + 1
+        if next_index >= len(self.levels):
+            # кампания закончилась
+            self._finish(True)
+            return
+
+        self._apply_level_cfg(next_index)
+
+    # ------------------------------------------------------------
+    # Player placement
+    # ------------------------------------------------------------
+
+    def _place_player_safe(self):
+        if self.maze_is_active and self.maze_floor_points:
+            cx = self.arena_w_px / 2
+            cy = self.arena_h_px / 2
+            best = self.maze_floor_points[0]
+            best_d = 10**18
+            for (x, y) in self.maze_floor_points:
+                dx = x - cx
+                dy = y - cy
+                d = dx * dx + dy * dy
+                if d < best_d:
+                    best_d = d
+                    best = (x, y)
+            self.player.x, self.player.y = best
+            return
+
+        if self.ring_is_active:
+            self.player.x = self._ring_cx
+            self.player.y = self._ring_cy
+            x2, y2, _ = self._push_circle_out_of_walls(self.player.x, self.player.y, self.player.radius, self.wall_index)
+            self.player.x = x2
+            self.player.y = y2
+            return
+
+        self.player.x = self.arena_w_px / 2
+        self.player.y = self.arena_h_px / 2
+
+    # ------------------------------------------------------------
+    # Walls
+    # ------------------------------------------------------------
+
+    def _build_walls_for_level(self):
+        pack = self.registry.pack_for(self.level_cfg)
+
+        self.maze_is_active = pack.kind == "maze"
+        self.maze_floor_points = pack.floor_points
+        self.ring_is_active = pack.kind == "ring"
+        if pack.ring is not None:
+            self._ring_cx, self._ring_cy, self._ring_w, self._ring_h = pack.ring
+
+        walls = pack.make_walls()
+        radii = set(ENEMY_RADIUS.values())
+        if pack.density is None:
+            # раскладка целиком статическая — индекс стен и точки спауна берём готовые из пакета
+            self.wall_index = pack.wall_index(self.tile)
+            self.spawn_index = pack.spawn_index(self.tile, radii)
+        else:
+            # у уровня без seed препятствия свои у каждого матча (зависят от seed мира)
+            obstacles = generate_obstacles(
+                self.arena_w_px, self.arena_h_px, self.tile, self.rng.getrandbits(32), pack.density
+            )
+            walls.extend(AABB(*r) for r in obstacles)
+            self.wall_index = WallIndex(walls, self.tile)
+            self.spawn_index = pack.spawn_index(self.tile, radii, self.wall_index)
+
+        if pack.grid is not None:
+            # пути по клеткам самой карты, а не по растру стен
+            ox, oy = pack.grid_origin
+            self.flow_field = FlowField.from_char_map(
+                pack.grid, ox, oy, self.tile, cells_per_tick=self.cfg.flow_cells_per_tick
+            )
+        else:
+            self.flow_field = FlowField.from_walls(
+                self.wall_index.bounds, self.arena_w_px, self.arena_h_px, self.tile,
+                cells_per_tick=self.cfg.flow_cells_per_tick
+            )
+        return walls
+
+    # ------------------------------------------------------------
+    # FX
+    # ------------------------------------------------------------
+
+    def _emit_hit_particles(self, x: float, y: float, count: int):
+        self.particles.emit(
+            x, y, count,
+            speed=(120, 420), ttl=(0.15, 0.5), size=(2, 5),
+            color=HIT_SPARK_COLOR
+        )
+
+    def _emit_explosion(self, x: float, y: float):
+        self.particles.emit(
+            x, y, 24,
+            speed=(180, 520), ttl=(0.2, 0.6), size=(3, 7),
+            color=EXPLOSION_COLOR
+        )
+
+    # ------------------------------------------------------------
+    # Spawn helpers
+    # ------------------------------------------------------------
+
+    def _spawn_wave(self):
+        wave_idx = self.waves_spawned
+        base_count = 4 + wave_idx * 2
+        self.spawn_enemies(base_count)
+
+    def spawn_enemies(self, count: int):
+        """Заспаунить count случайных врагов уровня в свободных от стен местах."""
+        # подальше от игрока; маска по расстоянию одна на всю волну
+        far = self.spawn_index.far_from(self.player.x, self.player.y, self.tile * SPAWN_MIN_DIST)
+        for _ in range(count):
+            et = self.rng.choice(self.enemy_types)
+            st = self.enemy_stats.get(et, {"hp": 25, "speed": 120})
+
+            radius = ENEMY_RADIUS.get(et, 16)
+            mass = ENEMY_MASS.get(et, 1.6)
+
+            spot = self.spawn_index.pick(self.rng, radius, far)
+            if spot is None:
+                spot = (self.arena_w_px / 2, self.arena_h_px / 2)
+            x, y = spot
+
+            e = self.enemy_pool.acquire(
+                et, float(x), float(y), float(radius),
+                float(st.get("speed", 120)), int(st.get("hp", 25)), float(mass)
+            )
+
+            if et == "tank":
+                e.shoot_interval = 1.4
+
+            e.save_prev()
+            self.enemies.append(e)
+
+    # ------------------------------------------------------------
+    # Waves update: next wave only after clear
+    # ------------------------------------------------------------
+
+    def _update_waves(self, dt: float):
+        if len(self.enemies) > 0:
+            self._waiting_next_wave = True
+            self._just_cleared = False
+            return
+
+        if self.waves_spawned > 0 and not self._just_cleared:
+            self.score.add_wave_complete(self.waves_spawned)
+            self._just_cleared = True
+            self._wave_wait_timer = self.spawn_interval
+            self._waiting_next_wave = True
+
+        if self.waves_spawned >= self.waves_total:
+            return
+
+        if self._waiting_next_wave:
+            self._wave_wait_timer -= dt
+            if self._wave_wait_timer <= 0:
+                self._spawn_wave()
+                self.waves_spawned += 1
+                self._waiting_next_wave = False
+                self._just_cleared = False
+
+    # ------------------------------------------------------------
+
+    def _is_win_condition_met(self) -> bool:
+        if self.level_cfg.get("winCondition") != "kill_all_after_waves":
+            return False
+        return (self.waves_spawned >= self.waves_total) and (len(self.enemies) == 0)
+
+    def _finish(self, victory: bool):
+        self.finished = True
+        self.victory = bool(victory)
+
+    def collect_results(self):
+        return {
+            "time_seconds": float(self.time_seconds),
+            "waves_spawned": int(self.waves_spawned),
+            "waves_total": int(self.waves_total),
+            "shots_fired": int(self.shots_fired),
+            "shots_hit": int(self.shots_hit),
+            "kills_total": int(self.kills_total),
+            "kills_by_type": dict(self.kills_by_type),
+            "hp_start": int(self._player_hp_start),
+            "hp_end": int(self.player.hp),
+            "campaign_mode": self.campaign_mode,
+        }
+
+    # ------------------------------------------------------------
+
+    def update(self, frame_dt: float) -> int:
+        """Продвинуть мир ровными тиками fixed_dt (не больше max_steps за кадр); вернуть число тиков."""
+        step = self.fixed_dt
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= step:
+            if steps >= self.max_steps:
+                # отстали слишком сильно — остаток времени выбрасываем
+                self.accumulator = 0.0
+                break
+            self.accumulator -= step
+            steps += 1
+            if not self.step(step):
+                self.accumulator = 0.0
+                break
+        return steps
+
+    def camera_center(self, x: float, y: float, view_w: float, view_h: float):
+        """Центр камеры над точкой (x, y), прижатый так, чтобы кадр не вылезал за арену."""
+        half_w = view_w / 2
+        half_h = view_h / 2
+        if x < half_w:
+            x = half_w
+        if y < half_h:
+            y = half_h
+        if x > self.arena_w_px - half_w:
+            x = self.arena_w_px - half_w
+        if y > self.arena_h_px - half_h:
+            y = self.arena_h_px - half_h
+        return x, y
+
+    def view_bounds(self):
+        """(left, right, bottom, top) кадра камеры, которая идёт за игроком."""
+        w = self.cfg.screen_width
+        h = self.cfg.screen_height
+        cx, cy = self.camera_center(self.player.x, self.player.y, w, h)
+        return cx - w / 2, cx + w / 2, cy - h / 2, cy + h / 2
+
+    def entity_counts(self):
+        return {
+            "enemies": len(self.enemies),
+            "ai_thinking": self.ai.last_thinking,
+            "ai_deferred": self.ai.last_deferred,
+            "bullets": self.projectiles.count,
+            "enemy_bullets": self.enemy_projectiles.count,
+            "particles": self.particles.count,
+            # за матч: сколько живых частиц вытеснено из-за нехватки ёмкости
+            "particles_evicted": self.particles.evicted,
+        }
+
+    def pool_stats(self):
+        """Пики занятости пулов за матч — по ним подбирается ёмкость под уровень."""
+        return {
+            "enemies": self.enemy_pool.stats(),
+            "bullets": {"capacity": self.projectiles.capacity, "high_water": self.projectiles.high_water},
+            "enemy_bullets": {"capacity": self.enemy_projectiles.capacity, "high_water": self.enemy_projectiles.high_water},
+            "particles": {"capacity": self.particles.capacity, "high_water": self.particles.high_water},
+        }
+
+    @property
+    def alpha(self) -> float:
+        """Доля пути между двумя последними тиками — для интерполяции отрисовки."""
+        return self.accumulator / self.fixed_dt
+
+    def _save_prev_state(self):
+        self.player.save_prev()
+        for e in self.enemies:
+            e.save_prev()
+
+    def step(self, dt: float) -> bool:
+        """Один тик симуляции. False — матч окончен или сменился уровень."""
+        if self.finished:
+            return False
+        prof = self.profiler
+        prof.mark()
+        self._save_prev_state()
+        self.time_seconds += dt
+
+        if self.player.hp <= 0:
+            self._finish(False)
+            return False
+
+        if self._level_intro_timer > 0:
+            self._level_intro_timer -= dt
+            if self._level_intro_timer < 0:
+                self._level_intro_timer = 0
+
+        self._update_waves(dt)
+        prof.lap("waves")
+
+        player_reach = self.player.radius + self.player.speed * dt + 1.0
+        self.player.update(dt, self.wall_index.near(self.player.x, self.player.y, player_reach), circle_aabb_hit)
+
+        if self.shooting:
+            shot = self.player.shoot_towards(
+                self.aim_x, self.aim_y,
+                self.cfg.bullet_speed, self.cfg.bullet_radius,
+                self.cfg.bullet_damage, self.cfg.bullet_knockback
+            )
+            if shot is not None:
+                self.projectiles.spawn(*shot)
+                self.shots_fired += 1
+                self.audio.play_shot()
+
+        prof.lap("player")
+
+        # движение думающих врагов одним пакетом по общему полю путей, затем
+        # стрельба по очереди; остальные едут по инерции до своего слота
+        self.flow_field.update(self.player.x, self.player.y)
+        think, elapsed, idle = self.ai.plan(self.enemies, self.player.x, self.player.y, dt, self.view_bounds())
+        t0 = time.perf_counter()
+        self._unstick_coasted(think, elapsed, dt)
+        step_enemies(think, dt, self.player.x, self.player.y, self.wall_index, self.flow_field, elapsed)
+        self.los.refresh(think, elapsed.tolist(), self.player.x, self.player.y, self.wall_index)
+        for e in think:
+            shot = e.try_shoot(self.player.x, self.player.y)
+            if shot is not None:
+                self.enemy_projectiles.spawn(*shot)
+        self.ai.record(len(think), time.perf_counter() - t0)
+        self.ai.coast(idle, dt)
+
+        prof.lap("enemies")
+
+        prev_px = float(self.player.x)
+        prev_py = float(self.player.y)
+
+        grid = self.spatial_hash
+        grid.rebuild(self.enemies, self.player)
+
+        self._separate_bodies(grid)
+
+        # не даём затолкать игрока в стену
+        self._player_post_physics_fix(prev_px, prev_py)
+        grid.move(PLAYER_KEY, self.player.x, self.player.y)
+
+        prof.lap("separation")
+
+        # ✅ контактный урон (и по игроку, и по врагу)
+        self._contact_timer -= dt
+        if self._contact_timer <= 0:
+            player_r = self.player.radius
+            for i in grid.query(self.player.x, self.player.y, player_r, LAYER_ENEMY):
+                e = self.enemies[i]
+                if circle_circle_hit(self.player.x, self.player.y, player_r, e.x, e.y, e.radius):
+                    # урон игроку
+                    self.player.hp -= self.cfg.contact_damage
+
+                    # ✅ урон врагу от героя
+                    e.hp -= int(self.player_contact_damage)
+
+                    self._emit_hit_particles(self.player.x, self.player.y, 12)
+                    self.audio.play_hit()
+
+                    if e.hp <= 0 and self.enemies.kill(i):
+                        self.score.add_kill(e.enemy_type)
+                        self.kills_total += 1
+                        self.kills_by_type[e.enemy_type] = int(self.kills_by_type.get(e.enemy_type, 0)) + 1
+                        self._emit_explosion(e.x, e.y)
+                        self.audio.play_explosion()
+
+                    self._contact_timer = self.cfg.contact_damage_interval
+                    break
+
+        prof.lap("contact")
+
+        # пули игрока -> враги (пакетно, по отрезку пути за тик)
+        bullets = self.projectiles
+        bullets.integrate(dt)
+        bullets.sweep_walls(self.wall_index)
+        if self.enemies:
+            ex, ey, er = circle_arrays(self.enemies)
+            for bi, ei, toi in bullets.hits(ex, ey, er):
+                e = self.enemies[ei]
+                # точка касания, а не конец отрезка пули за тик
+                bx, by = bullets.point_at(bi, toi)
+
+                self.shots_hit += 1
+                e.hp -= int(bullets.damage[bi])
+                e.apply_knockback(bx, by, float(bullets.knockback[bi]))
+                self._emit_hit_particles(bx, by, 10)
+                self.audio.play_hit()
+
+                if e.hp <= 0 and self.enemies.kill(ei):
+                    self.score.add_kill(e.enemy_type)
+                    self.kills_total += 1
+                    self.kills_by_type[e.enemy_type] = int(self.kills_by_type.get(e.enemy_type, 0)) + 1
+                    self._emit_explosion(e.x, e.y)
+                    self.audio.play_explosion()
+
+        # пули врагов -> игрок
+        ebullets = self.enemy_projectiles
+        ebullets.integrate(dt)
+        ebullets.sweep_walls(self.wall_index)
+        px, py, pr = circle_arrays((self.player,))
+        for bi, _, toi in ebullets.hits(px, py, pr):
+            self.player.hp -= int(ebullets.damage[bi])
+            self._emit_hit_particles(*ebullets.point_at(bi, toi), 14)
+            self.audio.play_hit()
+
+        prof.lap("bullets")
+
+        # чистка
+        bullets.compact()
+        ebullets.compact()
+        # мёртвые враги — обратно в пул; если за тик никто не умер, ничего не делается
+        self.enemies.compact(self.enemy_pool.release)
+
+        prof.lap("cleanup")
+
+        self.particles.update(dt)
+        prof.lap("particles")
+
+        # победа
+        if self._is_win_condition_met():
+            # ✅ одиночный уровень: сразу результаты
+            # ✅ кампания: грузим следующий (или результаты в конце)
+            self._advance_campaign_or_finish()
+            return False
+
+        return True
@@ -1,18 +1,18 @@
-import arcade
 import math
-from entities.projectile import Projectile
 
 class Player:
     __slots__ = (
         "x","y","radius","speed","hp","max_hp","mass",
         "up","down","left","right",
         "shoot_cooldown","_shoot_timer",
-        "texture"
+        "prev_x","prev_y"
     )
 
     def __init__(self, x, y, radius, speed, hp, mass=1.0):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.radius = radius
         self.speed = speed
         self.hp = hp
@@ -23,8 +23,6 @@ class Player:
         self.shoot_cooldown = 0.12
         self._shoot_timer = 0.0
 
-        self.texture = arcade.make_soft_square_texture(64, arcade.color.BLUE_SAPPHIRE, 255, 255)
-
     def update(self, dt: float, walls, collision_circle_rect_fn):
         self._shoot_timer = max(0.0, self._shoot_timer - dt)
 
@@ -50,6 +48,7 @@ class Player:
         return self._shoot_timer <= 0.0
 
     def shoot_towards(self, target_x: float, target_y: float, bullet_speed: float, bullet_radius: float, bullet_damage: int, bullet_knockback: float):
+        """Параметры новой пули (x, y, vx, vy, radius, damage, knockback) для ProjectileStore.spawn или None."""
         if not self.can_shoot():
             return None
         self._shoot_timer = self.shoot_cooldown
@@ -60,28 +59,12 @@ class Player:
         dx /= length
         dy /= length
 
-        return Projectile(
+        return (
             self.x, self.y,
             dx * bullet_speed, dy * bullet_speed,
             bullet_radius, bullet_damage, bullet_knockback
         )
 
-    def _draw_hp_bar(self):
-        bar_width = self.radius * 2
-        bar_height = 6
-        bar_x = self.x - bar_width / 2
-        bar_y = self.y - self.radius - 12
-        arcade.draw_lrbt_rectangle_filled(
-            bar_x, bar_x + bar_width, bar_y, bar_y + bar_height, arcade.color.DIM_GRAY
-        )
-        if self.max_hp > 0:
-            fill_width = bar_width * max(0.0, min(1.0, self.hp / self.max_hp))
-            arcade.draw_lrbt_rectangle_filled(
-                bar_x, bar_x + fill_width,  bar_y, bar_y + bar_height, arcade.color.GREEN
-            )
-
-    def draw(self):
-        size = self.radius * 2
-        arcade.draw_texture_rect(self.texture, arcade.rect.XYWH(self.x, self.y, size, size))
-        arcade.draw_text("Игрок", self.x, self.y + self.radius + 10, arcade.color.WHITE, 12, anchor_x="center", anchor_y="center")
-        self._draw_hp_bar()
+    def save_prev(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
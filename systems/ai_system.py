@@ -0,0 +1,396 @@
+import heapq
+import math
+
+import numpy as np
+
+from systems.collision_system import pairs_aabbs_toi, segments_aabbs_toi
+from systems.spatial_hash import DENSE_PAIR_LIMIT
+
+
+_SQRT2 = math.sqrt(2.0)
+
+# сколько точек вдоль отрезков брать за один пакет при обходе корзин
+_LOS_CHUNK_SAMPLES = 65_536
+
+# 8 соседей: (dx, dy, цена шага)
+_NEIGHBOURS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, _SQRT2), (1, -1, _SQRT2), (-1, 1, _SQRT2), (-1, -1, _SQRT2),
+)
+
+
+class FlowField:
+    """Общее поле путей к игроку: Дейкстра от его клетки, пересчёт по cells_per_tick клеток за тик."""
+
+    def __init__(self, blocked, origin_x: float, origin_y: float, cell: float, cells_per_tick=None):
+        self.blocked = np.asarray(blocked, dtype=bool)
+        self.rows, self.cols = self.blocked.shape
+        self.origin_x = float(origin_x)
+        self.origin_y = float(origin_y)
+        self.cell = float(cell)
+        # None — каждый пересчёт целиком за один тик
+        self.cells_per_tick = cells_per_tick
+
+        n = self.rows * self.cols
+        # расстояния последнего законченного поля
+        self.dist = np.full(n, np.inf)
+        # центр следующей клетки пути; NaN — идти некуда
+        self.next_x = np.full(n, np.nan)
+        self.next_y = np.full(n, np.nan)
+        self.goal = -1
+
+        self._links = self._build_links()
+        # незаконченная Дейкстра: расстояния, родители и куча
+        self._dist = None
+        self._parent = None
+        self._heap = []
+        self._ready = False
+
+    # ------------------------------------------------------------
+    # Построение сетки
+    # ------------------------------------------------------------
+
+    @classmethod
+    def from_char_map(cls, grid, origin_x: float, origin_y: float, cell: float, wall_char: str = "#",
+                      cells_per_tick=None):
+        """Сетка из текстовой карты (строка 0 — нижний ряд), как у лабиринта."""
+        blocked = np.array([[ch == wall_char for ch in row] for row in grid], dtype=bool).reshape(len(grid), -1)
+        return cls(blocked, origin_x, origin_y, cell, cells_per_tick)
+
+    @classmethod
+    def from_walls(cls, bounds, width: float, height: float, cell: float, cells_per_tick=None):
+        """Растеризация стен (l, r, b, t) на сетку арены: клетка закрыта, если стена её задевает."""
+        cols = max(1, int(math.ceil(width / cell)))
+        rows = max(1, int(math.ceil(height / cell)))
+        blocked = np.zeros((rows, cols), dtype=bool)
+        for (l, r, b, t) in bounds:
+            c0 = max(0, int(math.floor(l / cell)))
+            c1 = min(cols, int(math.ceil(r / cell)))
+            r0 = max(0, int(math.floor(b / cell)))
+            r1 = min(rows, int(math.ceil(t / cell)))
+            if c0 < c1 and r0 < r1:
+                blocked[r0:r1, c0:c1] = True
+        return cls(blocked, 0.0, 0.0, cell, cells_per_tick)
+
+    def _build_links(self):
+        """Для каждой открытой клетки — список (сосед, цена). Диагональ только без срезания угла."""
+        rows, cols = self.rows, self.cols
+        blocked = self.blocked
+        links = [()] * (rows * cols)
+        for r in range(rows):
+            for c in range(cols):
+                if blocked[r, c]:
+                    continue
+                out = []
+                for dx, dy, cost in _NEIGHBOURS:
+                    nc = c + dx
+                    nr = r + dy
+                    if nc < 0 or nr < 0 or nc >= cols or nr >= rows or blocked[nr, nc]:
+                        continue
+                    if dx != 0 and dy != 0 and (blocked[r, nc] or blocked[nr, c]):
+                        continue
+                    out.append((nr * cols + nc, cost))
+                links[r * cols + c] = tuple(out)
+        return links
+
+    # ------------------------------------------------------------
+    # Поле
+    # ------------------------------------------------------------
+
+    def cell_index(self, x: float, y: float) -> int:
+        """Индекс клетки под точкой или -1 вне сетки."""
+        c = math.floor((x - self.origin_x) / self.cell)
+        r = math.floor((y - self.origin_y) / self.cell)
+        if c < 0 or r < 0 or c >= self.cols or r >= self.rows:
+            return -1
+        return r * self.cols + c
+
+    def update(self, target_x: float, target_y: float) -> bool:
+        """Начать пересчёт, если цель сменила клетку, и продвинуть текущий. True — пересчёт начат."""
+        goal = self.cell_index(target_x, target_y)
+        started = goal != self.goal
+        if started:
+            self.goal = goal
+            self._start(goal)
+        if self._heap:
+            # ещё не закрытые клетки держат шаг прошлого поля — он ведёт в уже пересчитанную область
+            self._advance(self.cells_per_tick if self._ready else None)
+        return started
+
+    def _start(self, goal: int):
+        n = self.rows * self.cols
+        self._dist = [math.inf] * n
+        self._parent = [-1] * n
+        self._heap = []
+
+        if goal < 0:
+            self.dist.fill(np.inf)
+            self.next_x.fill(np.nan)
+            self.next_y.fill(np.nan)
+            return
+
+        if self.blocked.flat[goal]:
+            # игрок прижат к стене и клетка под ним закрыта — стартуем с открытых соседей
+            cols = self.cols
+            gr, gc = divmod(goal, cols)
+            sources = [
+                (gr + dy) * cols + (gc + dx)
+                for dx, dy, _ in _NEIGHBOURS
+                if 0 <= gc + dx < cols and 0 <= gr + dy < self.rows and not self.blocked[gr + dy, gc + dx]
+            ]
+        else:
+            sources = [goal]
+
+        for s in sources:
+            self._dist[s] = 0.0
+            self._heap.append((0.0, s))
+
+    def _advance(self, budget):
+        """Закрыть до budget клеток (None — все) и записать им следующий шаг."""
+        dist = self._dist
+        parent = self._parent
+        heap = self._heap
+        links = self._links
+        heappop = heapq.heappop
+        heappush = heapq.heappush
+
+        settled = []
+        limit = math.inf if budget is None else budget
+        while heap and len(settled) < limit:
+            d, i = heappop(heap)
+            if d > dist[i]:
+                continue
+            settled.append(i)
+            for j, cost in links[i]:
+                nd = d + cost
+                if nd < dist[j]:
+                    dist[j] = nd
+                    parent[j] = i
+                    heappush(heap, (nd, j))
+
+        if settled:
+            # у закрытой клетки «родитель» в дереве Дейкстры окончательный — это и есть следующий шаг к цели
+            idx = np.array(settled, dtype=np.int64)
+            nxt = np.array([parent[i] for i in settled], dtype=np.int64)
+            has_next = nxt >= 0
+            cols = self.cols
+            self.next_x[idx] = np.where(has_next, self.origin_x + (nxt % cols + 0.5) * self.cell, np.nan)
+            self.next_y[idx] = np.where(has_next, self.origin_y + (nxt // cols + 0.5) * self.cell, np.nan)
+
+        if not heap:
+            self.dist = np.array(dist)
+            # до недостижимых клеток волна не дошла — шаг из прошлого поля им не годится
+            unreached = np.isinf(self.dist)
+            self.next_x[unreached] = np.nan
+            self.next_y[unreached] = np.nan
+            self._ready = True
+
+    def directions(self, xs, ys, target_x: float, target_y: float):
+        """Единичные направления движения для точек (xs, ys) и расстояние до цели по прямой."""
+        dx = target_x - xs
+        dy = target_y - ys
+        dist = np.hypot(dx, dy)
+
+        c = np.floor((xs - self.origin_x) / self.cell).astype(np.int64)
+        r = np.floor((ys - self.origin_y) / self.cell).astype(np.int64)
+        inside = (c >= 0) & (r >= 0) & (c < self.cols) & (r < self.rows)
+        idx = np.where(inside, r * self.cols + c, 0)
+        nx = np.where(inside, self.next_x[idx], np.nan)
+        ny = np.where(inside, self.next_y[idx], np.nan)
+
+        follow = ~np.isnan(nx)
+        dx = np.where(follow, nx - xs, dx)
+        dy = np.where(follow, ny - ys, dy)
+
+        norm = np.hypot(dx, dy)
+        norm[norm == 0.0] = 1.0
+        return dx / norm, dy / norm, dist
+
+
+class AIScheduler:
+    """Ближние враги думают каждый тик, дальние — реже и в пределах бюджета; остальные едут по инерции."""
+
+    def __init__(self, near_radius: float, far_radius: float, mid_period: int, far_period: int,
+                 budget_ms: float, view_margin: float = 0.0):
+        self.near_r2 = float(near_radius) ** 2
+        self.view_margin = float(view_margin)
+        self.far_r2 = float(far_radius) ** 2
+        self.mid_period = max(1, int(mid_period))
+        self.far_period = max(1, int(far_period))
+        self.budget = float(budget_ms) / 1000.0
+
+        self.tick = 0
+        self._next_slot = 0
+        # секунд на одного думающего врага (скользящее среднее)
+        self._cost = 0.0
+
+        self.last_thinking = 0
+        self.last_deferred = 0
+
+    @classmethod
+    def from_config(cls, cfg):
+        return cls(
+            cfg.ai_near_radius, cfg.ai_far_radius, cfg.ai_mid_period, cfg.ai_far_period,
+            cfg.ai_budget_ms, cfg.ai_view_margin
+        )
+
+    def plan(self, enemies, player_x: float, player_y: float, dt: float, view=None):
+        """(думающие, их elapsed, едущие по инерции) на этот тик; view — кадр камеры (l, r, b, t)."""
+        self.tick += 1
+        n = len(enemies)
+        if n == 0:
+            self.last_thinking = 0
+            self.last_deferred = 0
+            return [], np.zeros(0), []
+
+        state = np.array([(e.x, e.y, e.ai_slot, e.ai_elapsed) for e in enemies], dtype=np.float64)
+        xs, ys, slots, elapsed = state.T
+        slots = slots.astype(np.int64)
+        elapsed += dt
+        fresh = np.flatnonzero(slots < 0)
+        if fresh.size:
+            slots[fresh] = np.arange(self._next_slot, self._next_slot + fresh.size)
+            self._next_slot += int(fresh.size)
+            for i in fresh.tolist():
+                enemies[i].ai_slot = int(slots[i])
+
+        d2 = (xs - player_x) ** 2 + (ys - player_y) ** 2
+        near = d2 <= self.near_r2
+        if view is not None:
+            m = self.view_margin
+            l, r, b, t = view
+            near |= (xs >= l - m) & (xs <= r + m) & (ys >= b - m) & (ys <= t + m)
+        period = np.where(d2 > self.far_r2, self.far_period, self.mid_period)
+        # в свой слот или уже пропустил его из-за бюджета
+        lod_due = ~near & (((self.tick + slots) % period == 0) | (elapsed > period * dt + 1e-9))
+
+        due_ids = np.flatnonzero(lod_due)
+        deferred = 0
+        if self._cost > 0.0 and due_ids.size:
+            # ближние думают всегда — дальним остаётся то, что они не съели
+            spare = self.budget - int(near.sum()) * self._cost
+            limit = max(1, int(spare / self._cost))
+            if due_ids.size > limit:
+                # дольше всех ждавшие — первыми
+                order = np.argsort(-elapsed[due_ids], kind="stable")
+                keep = np.zeros(n, dtype=bool)
+                keep[due_ids[order[:limit]]] = True
+                deferred = due_ids.size - limit
+                lod_due = keep
+
+        think_mask = near | lod_due
+        # ai_elapsed копится только по инерции — сбрасываем тем, кто ехал
+        for i in np.flatnonzero(think_mask & (elapsed > dt * 1.5)).tolist():
+            enemies[i].ai_elapsed = 0.0
+        if think_mask.all():
+            think = list(enemies)
+            idle = []
+        else:
+            flags = think_mask.tolist()
+            think = [e for e, t in zip(enemies, flags) if t]
+            idle = [e for e, t in zip(enemies, flags) if not t]
+
+        self.last_thinking = len(think)
+        self.last_deferred = deferred
+        return think, elapsed[think_mask], idle
+
+    def coast(self, idle, dt: float):
+        """Не думающие в этот тик едут по инерции; отложенные бюджетом надолго — стоят."""
+        limit = self.far_period * 2 * dt
+        for e in idle:
+            if e.ai_elapsed < limit:
+                e.x += e.vel_x * dt
+                e.y += e.vel_y * dt
+            e.ai_elapsed += dt
+
+    def record(self, thinking: int, seconds: float):
+        """Учесть, сколько заняли думающие в этом тике, — для бюджета."""
+        if thinking <= 0:
+            return
+        per = seconds / thinking
+        self._cost = per if self._cost == 0.0 else self._cost * 0.9 + per * 0.1
+
+
+class LineOfSight:
+    """Видит ли враг игрока (долетит ли пуля радиуса pad); кэш в has_los, обновление раз в refresh секунд."""
+
+    def __init__(self, refresh: float, pad: float = 0.0, types=None):
+        self.refresh_s = float(refresh)
+        self.pad = float(pad)
+        # каким типам врагов вообще нужна видимость (None — всем)
+        self.types = frozenset(types) if types is not None else None
+
+    def refresh(self, enemies, elapsed, target_x: float, target_y: float, wall_index):
+        """Перепроверить видимость у тех, чей кэш устарел; elapsed — время с прошлого шага у каждого."""
+        types = self.types
+        stale = []
+        for e, t in zip(enemies, elapsed):
+            if types is not None and e.enemy_type not in types:
+                continue
+            e._los_timer -= t
+            if e._los_timer <= 0.0:
+                stale.append(e)
+        if not stale:
+            return
+
+        xs = np.fromiter((e.x for e in stale), dtype=np.float64, count=len(stale))
+        ys = np.fromiter((e.y for e in stale), dtype=np.float64, count=len(stale))
+        visible = self.visible(xs, ys, target_x, target_y, wall_index)
+        for e, v in zip(stale, visible.tolist()):
+            e.has_los = v
+            e._los_timer = self.refresh_s
+
+    def visible(self, xs, ys, target_x: float, target_y: float, wall_index):
+        """Для каждой точки (xs[i], ys[i]) — не перекрыт ли отрезок до цели стенами."""
+        n = xs.shape[0]
+        out = np.ones(n, dtype=bool)
+        m = len(wall_index)
+        if n == 0 or m == 0:
+            return out
+
+        if n * m > DENSE_PAIR_LIMIT and self.pad < wall_index.cell_size:
+            self._visible_by_cells(xs, ys, float(target_x), float(target_y), wall_index, out)
+            return out
+
+        bounds = wall_index.bounds_array
+        tx = np.full(n, float(target_x))
+        ty = np.full(n, float(target_y))
+        pad = np.full(n, self.pad)
+        step = max(1, DENSE_PAIR_LIMIT // m)
+        for s in range(0, n, step):
+            e = min(n, s + step)
+            toi = segments_aabbs_toi(xs[s:e], ys[s:e], tx[s:e], ty[s:e], pad[s:e], bounds)
+            out[s:e] = ~np.isfinite(toi).any(axis=1)
+        return out
+
+    def _visible_by_cells(self, xs, ys, tx: float, ty: float, wall_index, out):
+        # при шаге точек <= 2 * (ячейка - pad) корзины 3x3 вокруг них накрывают весь отрезок
+        cells = wall_index.cell_index
+        bounds = wall_index.bounds_array
+        m = len(wall_index)
+        h = 2.0 * (cells.cell_size - self.pad)
+
+        # точек на отрезок, включая оба конца
+        k = np.floor(np.hypot(tx - xs, ty - ys) / h).astype(np.int64) + 2
+        ends = np.cumsum(k)
+        s = 0
+        n = xs.shape[0]
+        while s < n:
+            base = ends[s] - k[s]
+            e = max(s + 1, int(np.searchsorted(ends, base + _LOS_CHUNK_SAMPLES, side="right")))
+            kc = k[s:e]
+            seg = np.repeat(np.arange(s, e), kc)
+            t = (np.arange(seg.shape[0]) - np.repeat(ends[s:e] - kc - base, kc)) / np.repeat(kc - 1, kc)
+            sx = xs[seg] + (tx - xs[seg]) * t
+            sy = ys[seg] + (ty - ys[seg]) * t
+
+            q, ids = cells.pairs(sx, sy)
+            if q.size:
+                # одна проверка на пару (отрезок, стена), сколько бы точек её ни нашли
+                key = np.unique(seg[q] * m + ids)
+                si = key // m
+                wi = key % m
+                toi = pairs_aabbs_toi(xs[si], ys[si], np.full(si.shape[0], tx), np.full(si.shape[0], ty),
+                                      np.full(si.shape[0], self.pad), bounds[wi])
+                out[si[np.isfinite(toi)]] = False
+            s = e
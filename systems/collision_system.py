@@ -1,4 +1,7 @@
 import math
+
+import numpy as np
+
 from systems.aabb import AABB
 
 
@@ -35,3 +38,86 @@ def soft_separate_circles(x1, y1, r1, x2, y2, r2):
     ny = dy / dist
     push = overlap * 0.5
     return (x1 + nx * push, y1 + ny * push, x2 - nx * push, y2 - ny * push)
+
+
+# ------------------------------------------------------------
+# Swept (continuous) tests: отрезок движения за тик
+# ------------------------------------------------------------
+
+def segments_aabbs_toi(x0, y0, x1, y1, pad, bounds):
+    """(n, m) долей пути до входа круга радиуса pad в стену (со скруглёнными углами); np.inf — промах."""
+    return _aabb_toi(x0[:, None], y0[:, None], x1[:, None], y1[:, None], pad[:, None],
+                     bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3])
+
+
+def pairs_aabbs_toi(x0, y0, x1, y1, pad, bounds):
+    """То же по парам: i-й отрезок против i-й стены bounds (k, 4); результат (k,)."""
+    return _aabb_toi(x0, y0, x1, y1, pad, bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3])
+
+
+def _aabb_toi(x0, y0, x1, y1, pad, l, r, b, t):
+    tx0, tx1 = _slab(x0, x1 - x0, l - pad, r + pad)
+    ty0, ty1 = _slab(y0, y1 - y0, b - pad, t + pad)
+    t_near = np.maximum(np.maximum(tx0, ty0), 0.0)
+    t_far = np.minimum(np.minimum(tx1, ty1), 1.0)
+    toi = np.where(t_near <= t_far, t_near, np.inf)
+
+    # у расширенной на pad стены углы скруглены (как в circle_aabb_hit): если
+    # вход в квадратном углу, точное касание — с окружностью радиуса pad у вершины
+    with np.errstate(invalid="ignore"):
+        # при промахе t_near бывает inf, а шаг по оси — 0: там NaN, и угол не выбирается
+        ex = x0 + (x1 - x0) * t_near
+        ey = y0 + (y1 - y0) * t_near
+    corner = np.isfinite(toi) & ((ex < l) | (ex > r)) & ((ey < b) | (ey > t))
+    if corner.any():
+        x0, y0, x1, y1, pad, l, r, b, t, ex, ey = (
+            a[corner] for a in np.broadcast_arrays(x0, y0, x1, y1, pad, l, r, b, t, ex, ey)
+        )
+        vx = np.where(ex < l, l, r)
+        vy = np.where(ey < b, b, t)
+        toi[corner] = _circle_toi(x0, y0, x1, y1, pad, vx, vy, 0.0)
+    return toi
+
+
+def _slab(o, d, lo, hi):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (lo - o) / d
+        t2 = (hi - o) / d
+    t_in = np.minimum(t1, t2)
+    t_out = np.maximum(t1, t2)
+    parallel = d == 0.0
+    if parallel.any():
+        inside = (o >= lo) & (o <= hi)
+        t_in = np.where(parallel, np.where(inside, -np.inf, np.inf), t_in)
+        t_out = np.where(parallel, np.where(inside, np.inf, -np.inf), t_out)
+    return t_in, t_out
+
+
+def segments_circles_toi(x0, y0, x1, y1, r, cx, cy, cr):
+    """(n, m) долей пути до касания движущихся кругов с неподвижными; np.inf — промах."""
+    return _circle_toi(x0[:, None], y0[:, None], x1[:, None], y1[:, None], r[:, None],
+                       cx[None, :], cy[None, :], cr[None, :])
+
+
+def pairs_circles_toi(x0, y0, x1, y1, r, cx, cy, cr):
+    """То же по парам: i-й движущийся круг против i-го неподвижного; результат (k,)."""
+    return _circle_toi(x0, y0, x1, y1, r, cx, cy, cr)
+
+
+def _circle_toi(x0, y0, x1, y1, r, cx, cy, cr):
+    dx = x1 - x0
+    dy = y1 - y0
+    fx = x0 - cx
+    fy = y0 - cy
+    rs = r + cr
+
+    a = dx * dx + dy * dy
+    b = 2.0 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - rs * rs
+    disc = b * b - 4.0 * a * c
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (-b - np.sqrt(np.maximum(disc, 0.0))) / (2.0 * a)
+    moving_hit = (a > 0.0) & (disc >= 0.0) & (t >= 0.0) & (t <= 1.0)
+    out = np.where(moving_hit, t, np.inf)
+    return np.where(c < 0.0, 0.0, out)
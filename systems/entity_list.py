@@ -0,0 +1,66 @@
+class EntityList:
+    """Список сущностей: kill() только помечает, compact() в конце тика убирает мёртвых на месте."""
+
+    def __init__(self, items=()):
+        self._items = list(items)
+        self._dead = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, i):
+        return self._items[i]
+
+    def append(self, item):
+        self._items.append(item)
+
+    def clear(self):
+        """Убрать всех; вернуть убранных списком (например, чтобы отдать в пул)."""
+        out = self._items
+        self._items = []
+        self._dead = []
+        return out
+
+    def kill(self, i: int) -> bool:
+        """Пометить i-ю сущность мёртвой. False — она уже была мёртвой."""
+        item = self._items[i]
+        if not item.alive:
+            return False
+        item.alive = False
+        self._dead.append(i)
+        return True
+
+    def compact(self, on_remove=None, stable: bool = True) -> int:
+        """Удалить помеченных; on_remove(item) — для каждого удалённого. Вернуть, сколько удалено."""
+        dead = self._dead
+        if not dead:
+            return 0
+        items = self._items
+
+        if stable:
+            # всё до первого мёртвого уже на месте
+            w = min(dead)
+            for r in range(w, len(items)):
+                item = items[r]
+                if item.alive:
+                    items[w] = item
+                    w += 1
+                elif on_remove is not None:
+                    on_remove(item)
+            del items[w:]
+        else:
+            # с конца, чтобы переставленный последний элемент не был ещё не удалённым мёртвым
+            for i in sorted(dead, reverse=True):
+                item = items[i]
+                last = items.pop()
+                if i < len(items):
+                    items[i] = last
+                if on_remove is not None:
+                    on_remove(item)
+
+        removed = len(dead)
+        self._dead = []
+        return removed
@@ -0,0 +1,107 @@
+import math
+
+import numpy as np
+
+
+EVICT_OLDEST = "oldest"
+EVICT_LOWEST_TTL = "lowest_ttl"
+
+# TTL, при котором частица ещё полностью непрозрачна
+FADE_TTL = 0.5
+
+
+class ParticleSystem:
+    """Частицы фиксированной ёмкости в массивах NumPy; при переполнении вытесняются по evict_policy."""
+
+    def __init__(self, capacity: int = 4096, evict_policy: str = EVICT_OLDEST, rng=None):
+        if evict_policy not in (EVICT_OLDEST, EVICT_LOWEST_TTL):
+            raise ValueError("Unknown particle evict policy: " + str(evict_policy))
+
+        self.capacity = max(1, int(capacity))
+        self.evict_policy = evict_policy
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        cap = self.capacity
+        self.x = np.zeros(cap, dtype=np.float64)
+        self.y = np.zeros(cap, dtype=np.float64)
+        self.vx = np.zeros(cap, dtype=np.float64)
+        self.vy = np.zeros(cap, dtype=np.float64)
+        self.ttl = np.zeros(cap, dtype=np.float64)
+        self.size = np.zeros(cap, dtype=np.float64)
+        self.color = np.zeros((cap, 3), dtype=np.uint8)
+        self.alive = np.zeros(cap, dtype=bool)
+
+        self._cursor = 0
+        self.count = 0
+        self.evicted = 0
+        # наибольшее число живых частиц одновременно
+        self.high_water = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.alive[:] = False
+        self.ttl[:] = 0.0
+        self._cursor = 0
+        self.count = 0
+
+    def _take_slots(self, n: int):
+        cap = self.capacity
+        if self.evict_policy == EVICT_OLDEST:
+            slots = (self._cursor + np.arange(n)) % cap
+            self._cursor = (self._cursor + n) % cap
+            self.evicted += int(np.count_nonzero(self.alive[slots]))
+            return slots
+
+        free = np.flatnonzero(~self.alive)
+        if free.size >= n:
+            return free[:n]
+        need = n - free.size
+        busy = np.flatnonzero(self.alive)
+        victims = busy[np.argpartition(self.ttl[busy], need - 1)[:need]]
+        self.evicted += need
+        return np.concatenate((free, victims))
+
+    def emit(self, x: float, y: float, count: int, speed, ttl, size, color):
+        """Вспышка из count частиц во все стороны; speed/ttl/size — диапазоны (lo, hi)."""
+        n = min(int(count), self.capacity)
+        if n <= 0:
+            return
+
+        slots = self._take_slots(n)
+        self.count += n - int(np.count_nonzero(self.alive[slots]))
+        if self.count > self.high_water:
+            self.high_water = self.count
+
+        rng = self.rng
+        ang = rng.uniform(0.0, math.tau, n)
+        sp = rng.uniform(speed[0], speed[1], n)
+
+        self.x[slots] = x
+        self.y[slots] = y
+        self.vx[slots] = np.cos(ang) * sp
+        self.vy[slots] = np.sin(ang) * sp
+        self.ttl[slots] = rng.uniform(ttl[0], ttl[1], n)
+        self.size[slots] = rng.uniform(size[0], size[1], n)
+        self.color[slots] = color[:3]
+        self.alive[slots] = True
+
+    def update(self, dt: float):
+        if self.count == 0:
+            return
+        alive = self.alive
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.ttl -= dt
+        alive &= self.ttl > 0.0
+        self.count = int(np.count_nonzero(alive))
+
+    def lerp_positions(self, idx, alpha: float, step: float):
+        """Позиции частиц idx между прошлым и текущим тиком шага step (полёт прямолинейный)."""
+        back = (1.0 - alpha) * step
+        return self.x[idx] - self.vx[idx] * back, self.y[idx] - self.vy[idx] * back
+
+    def alpha(self, idx):
+        """Прозрачность частиц idx (0..255): гаснут последние FADE_TTL секунд."""
+        return np.clip(255.0 * self.ttl[idx] / FADE_TTL, 0, 255).astype(np.uint8)
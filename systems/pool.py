@@ -0,0 +1,37 @@
+class ObjectPool:
+    """Пул объектов с reset(*args); high_water — пик одновременно занятых."""
+
+    def __init__(self, cls):
+        self.cls = cls
+        self._free = []
+        self.in_use = 0
+        self.created = 0
+        self.high_water = 0
+
+    def acquire(self, *args):
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(*args)
+        else:
+            obj = self.cls(*args)
+            self.created += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        self.in_use -= 1
+        self._free.append(obj)
+
+    def release_all(self, objs):
+        self.in_use -= len(objs)
+        self._free.extend(objs)
+
+    def stats(self):
+        return {
+            "in_use": self.in_use,
+            "free": len(self._free),
+            "created": self.created,
+            "high_water": self.high_water,
+        }
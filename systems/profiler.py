@@ -0,0 +1,123 @@
+import csv
+import time
+from collections import deque
+
+
+# Этапы кадра в порядке выполнения (колонки CSV)
+UPDATE_STAGES = (
+    "waves", "player", "enemies", "separation", "contact",
+    "bullets", "cleanup", "particles",
+)
+DRAW_STAGES = ("draw_world", "draw_hud")
+STAGES = UPDATE_STAGES + DRAW_STAGES
+
+
+class FrameProfiler:
+    """Таймеры этапов кадра (mark/lap) с кольцевым буфером; кадр закрывает end_frame()."""
+
+    def __init__(self, history: int = 240):
+        self.enabled = False
+        self.frames = deque(maxlen=max(1, int(history)))
+        self._current = {}
+        self._open = False
+        self._t = 0.0
+        self._frame_t0 = 0.0
+
+        self._csv_file = None
+        self._csv_writer = None
+        self._csv_count_keys = ()
+        self.csv_path = None
+
+    # ------------------------------------------------------------
+    # Замеры
+    # ------------------------------------------------------------
+
+    def begin_frame(self):
+        self.mark()
+
+    def mark(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if not self._open:
+            self._open = True
+            self._frame_t0 = now
+        self._t = now
+
+    def lap(self, stage: str):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        cur = self._current
+        cur[stage] = cur.get(stage, 0.0) + (now - self._t)
+        self._t = now
+
+    def end_frame(self, counts=None):
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self._frame_t0
+        frame = {
+            "stages": {k: v * 1000.0 for k, v in self._current.items()},
+            "total": total * 1000.0,
+            "counts": dict(counts) if counts else {},
+        }
+        self.frames.append(frame)
+        if self._csv_writer is not None:
+            self._write_csv_row(frame)
+
+        # следующий кадр начинается с нуля
+        self._current = {}
+        self._open = False
+        self._frame_t0 = 0.0
+
+    # ------------------------------------------------------------
+    # Сводка для оверлея
+    # ------------------------------------------------------------
+
+    def summary(self):
+        """{этап: (среднее, худшее)} в мс по буферу + худший кадр целиком."""
+        n = len(self.frames)
+        out = {}
+        if n == 0:
+            return out, 0.0, 0.0
+        for stage in STAGES:
+            vals = [f["stages"].get(stage, 0.0) for f in self.frames]
+            out[stage] = (sum(vals) / n, max(vals))
+        totals = [f["total"] for f in self.frames]
+        return out, sum(totals) / n, max(totals)
+
+    def last_counts(self):
+        if not self.frames:
+            return {}
+        return self.frames[-1]["counts"]
+
+    # ------------------------------------------------------------
+    # CSV
+    # ------------------------------------------------------------
+
+    @property
+    def csv_active(self) -> bool:
+        return self._csv_writer is not None
+
+    def start_csv(self, path: str, count_keys=()):
+        self.stop_csv()
+        self.csv_path = path
+        self._csv_count_keys = tuple(count_keys)
+        self._csv_file = open(path, "w", newline="", encoding="utf-8")
+        self._csv_writer = csv.writer(self._csv_file)
+        self._csv_writer.writerow(("time",) + STAGES + ("total",) + self._csv_count_keys)
+
+    def _write_csv_row(self, frame):
+        stages = frame["stages"]
+        counts = frame["counts"]
+        row = [f"{time.time():.3f}"]
+        row.extend(f"{stages.get(s, 0.0):.4f}" for s in STAGES)
+        row.append(f"{frame['total']:.4f}")
+        row.extend(counts.get(k, 0) for k in self._csv_count_keys)
+        self._csv_writer.writerow(row)
+
+    def stop_csv(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+        self._csv_file = None
+        self._csv_writer = None
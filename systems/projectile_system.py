@@ -0,0 +1,210 @@
+import numpy as np
+
+from systems.collision_system import (
+    pairs_aabbs_toi, pairs_circles_toi, segments_aabbs_toi, segments_circles_toi
+)
+from systems.spatial_hash import DENSE_PAIR_LIMIT, CellIndex
+
+
+# Сколько пуль за раз сравниваем со всеми целями (ограничивает размер матрицы)
+_HIT_CHUNK = 2048
+
+
+def circle_arrays(bodies):
+    """(x, y, radius) всех тел колонками NumPy — цели для ProjectileStore.hits()."""
+    n = len(bodies)
+    xs = np.fromiter((b.x for b in bodies), dtype=np.float64, count=n)
+    ys = np.fromiter((b.y for b in bodies), dtype=np.float64, count=n)
+    rs = np.fromiter((b.radius for b in bodies), dtype=np.float64, count=n)
+    return xs, ys, rs
+
+
+class ProjectileStore:
+    """Пули структурой массивов: живые в [0, count), столкновения по всему отрезку за тик."""
+
+    def __init__(self, capacity: int = 256):
+        self.count = 0
+        # наибольшее число живых пуль одновременно
+        self.high_water = 0
+        self._alloc(max(1, int(capacity)))
+
+    def _alloc(self, capacity: int):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.px = np.zeros(capacity, dtype=np.float64)
+        self.py = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.radius = np.zeros(capacity, dtype=np.float64)
+        self.damage = np.zeros(capacity, dtype=np.int64)
+        self.knockback = np.zeros(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # доля пути за тик до первой стены (inf — стены на пути нет)
+        self.wall_t = np.full(capacity, np.inf, dtype=np.float64)
+
+    def _arrays(self):
+        return (self.x, self.y, self.px, self.py, self.vx, self.vy,
+                self.radius, self.damage, self.knockback, self.alive, self.wall_t)
+
+    def _grow(self):
+        n = self.count
+        old = self._arrays()
+        self._alloc(self.capacity * 2)
+        for src, dst in zip(old, self._arrays()):
+            dst[:n] = src[:n]
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, x, y, vx, vy, radius, damage, knockback):
+        if self.count >= self.capacity:
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.px[i] = x
+        self.py[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.radius[i] = radius
+        self.damage[i] = damage
+        self.knockback[i] = knockback
+        self.alive[i] = True
+        self.wall_t[i] = np.inf
+        self.count = i + 1
+        if self.count > self.high_water:
+            self.high_water = self.count
+        return i
+
+    def integrate(self, dt: float):
+        n = self.count
+        self.px[:n] = self.x[:n]
+        self.py[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+
+    def lerp_positions(self, alpha: float):
+        """Позиции живых пуль между прошлым и текущим тиком (для отрисовки)."""
+        n = self.count
+        px = self.px[:n]
+        py = self.py[:n]
+        return px + (self.x[:n] - px) * alpha, py + (self.y[:n] - py) * alpha
+
+    def point_at(self, i: int, t: float):
+        """Точка на отрезке i-й пули за этот тик: t — доля пути (toi из hits())."""
+        px = float(self.px[i])
+        py = float(self.py[i])
+        return px + (float(self.x[i]) - px) * t, py + (float(self.y[i]) - py) * t
+
+    def _sweep_circles(self):
+        """Середины отрезков за тик и радиус круга, накрывающего весь заметённый пулей путь."""
+        n = self.count
+        px = self.px[:n]
+        py = self.py[:n]
+        x = self.x[:n]
+        y = self.y[:n]
+        reach = np.hypot(x - px, y - py) * 0.5 + self.radius[:n]
+        return (px + x) * 0.5, (py + y) * 0.5, reach
+
+    def sweep_walls(self, wall_index):
+        """Для каждой пули — момент входа в первую стену за тик (убирается такая пуля в compact())."""
+        n = self.count
+        self.wall_t[:n] = np.inf
+        if n == 0 or len(wall_index) == 0:
+            return
+        bounds = wall_index.bounds_array
+
+        if n * len(wall_index) <= DENSE_PAIR_LIMIT:
+            self._sweep_walls_dense(np.arange(n), bounds)
+            return
+
+        cells = wall_index.cell_index
+        mx, my, reach = self._sweep_circles()
+        # путь пули целиком в 3x3 корзинах вокруг середины, если он не длиннее корзины
+        near = np.flatnonzero(reach <= cells.cell_size)
+        if near.size < n:
+            self._sweep_walls_dense(np.flatnonzero(reach > cells.cell_size), bounds)
+
+        q, ids = cells.pairs(mx[near], my[near])
+        if q.size == 0:
+            return
+        rows = near[q]
+        toi = pairs_aabbs_toi(self.px[rows], self.py[rows], self.x[rows], self.y[rows], self.radius[rows], bounds[ids])
+        np.minimum.at(self.wall_t, rows, toi)
+
+    def _sweep_walls_dense(self, rows, bounds):
+        for s in range(0, rows.shape[0], _HIT_CHUNK):
+            r = rows[s:s + _HIT_CHUNK]
+            toi = segments_aabbs_toi(self.px[r], self.py[r], self.x[r], self.y[r], self.radius[r], bounds)
+            self.wall_t[r] = toi.min(axis=1)
+
+    def hits(self, tx, ty, tr):
+        """Первые попадания живых пуль раньше стены: [(пуля, цель, toi)] по порядку пуль; попавшие гасятся."""
+        n = self.count
+        m = len(tx)
+        if n == 0 or m == 0:
+            return []
+
+        if n * m <= DENSE_PAIR_LIMIT:
+            out = []
+            for s in range(0, n, _HIT_CHUNK):
+                e = min(n, s + _HIT_CHUNK)
+                toi = segments_circles_toi(
+                    self.px[s:e], self.py[s:e], self.x[s:e], self.y[s:e],
+                    self.radius[s:e], tx, ty, tr
+                )
+                cols = toi.argmin(axis=1)
+                first = toi[np.arange(e - s), cols]
+                rows = np.flatnonzero(self.alive[s:e] & (first < self.wall_t[s:e]))
+                if rows.size == 0:
+                    continue
+                self.alive[s + rows] = False
+                out.extend(zip((s + rows).tolist(), cols[rows].tolist(), first[rows].tolist()))
+            return out
+
+        mx, my, reach = self._sweep_circles()
+        # ячейка не меньше пути пули плюс радиус цели: хватает соседних ячеек
+        cells = CellIndex.from_points(tx, ty, float(reach.max() + tr.max()))
+        rows, ids = cells.pairs(mx, my)
+        if rows.size == 0:
+            return []
+        keep = self.alive[rows]
+        rows = rows[keep]
+        ids = ids[keep]
+        toi = pairs_circles_toi(self.px[rows], self.py[rows], self.x[rows], self.y[rows], self.radius[rows],
+                                tx[ids], ty[ids], tr[ids])
+        keep = toi < self.wall_t[rows]
+        rows = rows[keep]
+        ids = ids[keep]
+        toi = toi[keep]
+        if rows.size == 0:
+            return []
+
+        # у каждой пули — самое раннее касание (при равенстве — цель с меньшим индексом)
+        order = np.lexsort((ids, toi, rows))
+        rows = rows[order]
+        ids = ids[order]
+        toi = toi[order]
+        first = np.r_[True, rows[1:] != rows[:-1]]
+        rows = rows[first]
+        self.alive[rows] = False
+        return list(zip(rows.tolist(), ids[first].tolist(), toi[first].tolist()))
+
+    def compact(self):
+        """Убирает погасшие и упёршиеся в стену пули, сохраняя порядок остальных."""
+        n = self.count
+        alive = self.alive[:n]
+        alive &= np.isinf(self.wall_t[:n])
+        k = int(np.count_nonzero(alive))
+        if k == n:
+            return
+        for arr in (self.x, self.y, self.px, self.py, self.vx, self.vy,
+                    self.radius, self.damage, self.knockback):
+            arr[:k] = arr[:n][alive]
+        self.alive[:k] = True
+        self.wall_t[:k] = np.inf
+        self.count = k
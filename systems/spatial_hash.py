@@ -0,0 +1,185 @@
+import math
+
+import numpy as np
+
+
+# Слои коллизий (битовые флаги); пули живут в ProjectileStore и в сетку не кладутся
+LAYER_PLAYER = 1
+LAYER_ENEMY = 2
+
+PLAYER_KEY = -1
+
+# Порог (объекты * кандидаты), до которого пакетные проверки идут одной
+# плотной матрицей без broadphase; он же — размер одного пакета
+DENSE_PAIR_LIMIT = 250_000
+
+# сколько ячеек может быть в плотной таблице CellIndex; больше — ячейки укрупняются
+_GRID_LIMIT = 1 << 22
+
+_NO_IDS = np.zeros(0, dtype=np.int64)
+
+
+class CellIndex:
+    """Пакетный аналог SpatialHash на NumPy: pairs() — все пары (запрос, объект) из соседних ячеек."""
+
+    def __init__(self, cx, cy, ids, cell_size: float):
+        cx = np.asarray(cx, dtype=np.int64)
+        cy = np.asarray(cy, dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int64)
+        self.cell_size = float(cell_size)
+        if ids.shape[0] == 0:
+            self._x0 = self._y0 = 0
+            self._w = self._h = 0
+            self._start = self._count = _NO_IDS
+            self._ids = _NO_IDS
+            return
+
+        w = int(cx.max() - cx.min()) + 3
+        h = int(cy.max() - cy.min()) + 3
+        if w * h > _GRID_LIMIT:
+            f = int(math.ceil(math.sqrt(w * h / _GRID_LIMIT)))
+            cx = cx // f
+            cy = cy // f
+            self.cell_size *= f
+
+        # копии в 3x3 вокруг своей ячейки
+        d = np.array([-1, 0, 1], dtype=np.int64)
+        cx = (cx[:, None] + np.repeat(d, 3)).ravel()
+        cy = (cy[:, None] + np.tile(d, 3)).ravel()
+        ids = np.repeat(ids, 9)
+        w = int(cx.max() - cx.min()) + 1
+        h = int(cy.max() - cy.min()) + 1
+
+        self._x0 = int(cx.min())
+        self._y0 = int(cy.min())
+        self._w = w
+        self._h = h
+        # по ячейкам, внутри ячейки — по id, без повторов
+        stride = int(ids.max()) + 1
+        key = np.unique(((cx - self._x0) * h + (cy - self._y0)) * stride + ids)
+        flat = key // stride
+        self._ids = key % stride
+        self._count = np.bincount(flat, minlength=w * h)
+        self._start = np.cumsum(self._count) - self._count
+
+    @classmethod
+    def from_points(cls, xs, ys, cell_size: float):
+        """Каждая точка i — в ячейке своего центра."""
+        cx = np.floor(xs / cell_size).astype(np.int64)
+        cy = np.floor(ys / cell_size).astype(np.int64)
+        return cls(cx, cy, np.arange(xs.shape[0]), cell_size)
+
+    @classmethod
+    def from_buckets(cls, buckets, cell_size: float):
+        """Из словаря (cx, cy) -> [id] (корзины WallIndex)."""
+        cx = []
+        cy = []
+        ids = []
+        for (x, y), bucket in buckets.items():
+            cx.extend([x] * len(bucket))
+            cy.extend([y] * len(bucket))
+            ids.extend(bucket)
+        return cls(cx, cy, ids, cell_size)
+
+    def pairs(self, qx, qy):
+        """Все пары (индекс запроса, id) из 3x3 ячеек вокруг каждой точки запроса."""
+        cs = self.cell_size
+        n = qx.shape[0]
+        if n == 0 or self._ids.shape[0] == 0:
+            return _NO_IDS, _NO_IDS
+
+        gx = np.floor(qx / cs).astype(np.int64) - self._x0
+        gy = np.floor(qy / cs).astype(np.int64) - self._y0
+        inside = np.flatnonzero((gx >= 0) & (gx < self._w) & (gy >= 0) & (gy < self._h))
+        flat = gx[inside] * self._h + gy[inside]
+        counts = self._count[flat]
+        total = int(counts.sum())
+        if total == 0:
+            return _NO_IDS, _NO_IDS
+
+        query = np.repeat(inside, counts)
+        # позиции внутри отсортированных корзин: начало каждой ячейки + смещение внутри неё
+        run_start = np.repeat(np.cumsum(counts) - counts, counts)
+        pos = np.repeat(self._start[flat], counts) + (np.arange(total) - run_start)
+        return query, self._ids[pos]
+
+
+class SpatialHash:
+    """Сетка для broadphase круг-круг: объект в ячейке своего центра, запрос — ключи по возрастанию."""
+
+    def __init__(self, cell_size: float):
+        self.base_cell_size = float(cell_size)
+        self.cell_size = float(cell_size)
+        self._cells = {}   # (cx, cy) -> list[key]
+        self._items = {}   # key -> [x, y, r, layer, cell]
+        self._max_radius = 0.0
+
+    def _cell_of(self, x: float, y: float):
+        cs = self.cell_size
+        return (math.floor(x / cs), math.floor(y / cs))
+
+    def clear(self):
+        self._cells.clear()
+        self._items.clear()
+        self._max_radius = 0.0
+
+    def rebuild(self, enemies, player=None):
+        """Пересобрать сетку: враги по индексам + игрок (если передан)."""
+        self.clear()
+
+        max_r = player.radius if player is not None else 0.0
+        for e in enemies:
+            if e.radius > max_r:
+                max_r = e.radius
+        # запас на раздвижение внутри тика: ячейка >= 4 радиусов
+        self.cell_size = max(self.base_cell_size, 4.0 * max_r)
+
+        for i, e in enumerate(enemies):
+            self.insert(i, e.x, e.y, e.radius, LAYER_ENEMY)
+        if player is not None:
+            self.insert(PLAYER_KEY, player.x, player.y, player.radius, LAYER_PLAYER)
+
+    def insert(self, key: int, x: float, y: float, radius: float, layer: int):
+        cell = self._cell_of(x, y)
+        self._items[key] = [x, y, radius, layer, cell]
+        self._cells.setdefault(cell, []).append(key)
+        if radius > self._max_radius:
+            self._max_radius = radius
+
+    def move(self, key: int, x: float, y: float):
+        item = self._items.get(key)
+        if item is None:
+            return
+        item[0] = x
+        item[1] = y
+        cell = self._cell_of(x, y)
+        if cell != item[4]:
+            bucket = self._cells[item[4]]
+            bucket.remove(key)
+            if not bucket:
+                del self._cells[item[4]]
+            self._cells.setdefault(cell, []).append(key)
+            item[4] = cell
+
+    def query(self, x: float, y: float, radius: float, mask: int):
+        """Кандидаты, чей слой входит в mask и чьи ячейки задевает круг (x, y, radius)."""
+        reach = radius + self._max_radius
+        cs = self.cell_size
+        x0 = math.floor((x - reach) / cs)
+        x1 = math.floor((x + reach) / cs)
+        y0 = math.floor((y - reach) / cs)
+        y1 = math.floor((y + reach) / cs)
+
+        cells = self._cells
+        items = self._items
+        out = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for key in bucket:
+                    if items[key][3] & mask:
+                        out.append(key)
+        out.sort()
+        return out
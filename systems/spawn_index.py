@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+
+
+_SQRT2 = math.sqrt(2.0)
+
+
+class SpawnIndex:
+    """Свободные от стен точки спауна, заранее посчитанные для каждого радиуса врага."""
+
+    def __init__(self, xs, ys, clearance, radii, jitter: float = 0.0):
+        """clearance[i] — расстояние от точки i до ближайшей стены."""
+        self.jitter = float(jitter)
+        self.radii = sorted(set(float(r) for r in radii))
+        self._xs = {}
+        self._ys = {}
+
+        reach = self.jitter * _SQRT2
+        for r in self.radii:
+            ok = clearance >= r + reach
+            self._xs[r] = xs[ok]
+            self._ys[r] = ys[ok]
+
+    @classmethod
+    def from_points(cls, points, radii, wall_index):
+        """Ровно эти точки (например, центры клеток пола лабиринта), без сдвига."""
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        xs = pts[:, 0]
+        ys = pts[:, 1]
+        bounds = wall_index.bounds_array
+        if xs.shape[0] == 0 or bounds.shape[0] == 0:
+            clearance = np.full(xs.shape[0], np.inf)
+        else:
+            dx = xs[:, None] - np.clip(xs[:, None], bounds[:, 0], bounds[:, 1])
+            dy = ys[:, None] - np.clip(ys[:, None], bounds[:, 2], bounds[:, 3])
+            clearance = np.sqrt(dx * dx + dy * dy).min(axis=1)
+        return cls(xs, ys, clearance, radii)
+
+    @classmethod
+    def grid(cls, left: float, bottom: float, right: float, top: float, step: float, radii, wall_index):
+        """Клетки step x step внутри прямоугольника; точка спауна — где угодно в клетке."""
+        cols = max(0, int((right - left) // step))
+        rows = max(0, int((top - bottom) // step))
+        gx = left + (np.arange(cols) + 0.5) * step
+        gy = bottom + (np.arange(rows) + 0.5) * step
+
+        # дальше этого расстояния стены никому не мешают
+        limit = max(radii) + step / 2 * _SQRT2 + 1.0
+        clearance = np.full((rows, cols), limit)
+        for (l, r, b, t) in wall_index.bounds:
+            c0 = int(np.searchsorted(gx, l - limit))
+            c1 = int(np.searchsorted(gx, r + limit, side="right"))
+            r0 = int(np.searchsorted(gy, b - limit))
+            r1 = int(np.searchsorted(gy, t + limit, side="right"))
+            if c0 >= c1 or r0 >= r1:
+                continue
+            x = gx[c0:c1]
+            y = gy[r0:r1]
+            dx = x - np.clip(x, l, r)
+            dy = y - np.clip(y, b, t)
+            d = np.sqrt(dy[:, None] ** 2 + dx[None, :] ** 2)
+            block = clearance[r0:r1, c0:c1]
+            np.minimum(block, d, out=block)
+
+        xx, yy = np.meshgrid(gx, gy)
+        return cls(xx.ravel(), yy.ravel(), clearance.ravel(), radii, jitter=step / 2)
+
+    def radius_class(self, radius: float) -> float:
+        """Наименьший класс, в который помещается radius (или самый крупный)."""
+        for r in self.radii:
+            if radius <= r:
+                return r
+        return self.radii[-1]
+
+    def far_from(self, x: float, y: float, min_dist: float):
+        """Индексы точек каждого класса не ближе min_dist к (x, y); если таких нет — все точки класса."""
+        out = {}
+        # с учётом сдвига внутри клетки
+        md = min_dist + self.jitter * _SQRT2
+        md2 = md * md
+        for r in self.radii:
+            xs = self._xs[r]
+            ys = self._ys[r]
+            far = np.flatnonzero((xs - x) ** 2 + (ys - y) ** 2 >= md2)
+            out[r] = far if far.size > 0 else np.arange(xs.shape[0])
+        return out
+
+    def pick(self, rng, radius: float, far):
+        """Случайная свободная точка для тела радиуса radius из набора far_from; None — мест нет."""
+        r = self.radius_class(radius)
+        ids = far[r]
+        if ids.size == 0:
+            return None
+        i = int(ids[rng.randrange(ids.size)])
+        x = float(self._xs[r][i])
+        y = float(self._ys[r][i])
+        if self.jitter > 0:
+            x += rng.uniform(-self.jitter, self.jitter)
+            y += rng.uniform(-self.jitter, self.jitter)
+        return x, y
@@ -0,0 +1,111 @@
+import numpy as np
+
+from entities.enemy import CHARGER_DASH_MULT, CHARGER_DASH_RANGE, KNOCK_DECAY
+from systems.spatial_hash import DENSE_PAIR_LIMIT
+
+
+_FIELDS = (
+    "x", "y", "radius", "speed",
+    "knock_vx", "knock_vy",
+    "_shoot_timer", "_dash_cd", "_dash_t",
+    "dash_time", "dash_cooldown",
+)
+
+
+def circles_blocked(xs, ys, rs, wall_index):
+    """Для каждого круга (xs[i], ys[i], rs[i]) — задевает ли он хоть одну стену."""
+    n = xs.shape[0]
+    m = len(wall_index)
+    if n == 0 or m == 0:
+        return np.zeros(n, dtype=bool)
+
+    if n * m <= DENSE_PAIR_LIMIT:
+        return _blocked_by(xs, ys, rs, wall_index.bounds_array)
+
+    # Много стен: группируем круги по ячейкам индекса и проверяем каждую
+    # группу только против стен из соседних ячеек.
+    cs = wall_index.cell_size
+    cx = np.floor(xs / cs).astype(np.int64)
+    cy = np.floor(ys / cs).astype(np.int64)
+    order = np.lexsort((cy, cx))
+    cx_s = cx[order]
+    cy_s = cy[order]
+    starts = np.flatnonzero(np.r_[True, (cx_s[1:] != cx_s[:-1]) | (cy_s[1:] != cy_s[:-1])])
+    ends = np.r_[starts[1:], n]
+
+    out = np.zeros(n, dtype=bool)
+    bounds = wall_index.bounds_array
+    for s, e in zip(starts.tolist(), ends.tolist()):
+        ids = wall_index.ids_around_cell(int(cx_s[s]), int(cy_s[s]))
+        if not ids:
+            continue
+        idx = order[s:e]
+        out[idx] = _blocked_by(xs[idx], ys[idx], rs[idx], bounds[ids])
+    return out
+
+
+def _blocked_by(xs, ys, rs, bounds):
+    l, r, b, t = bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3]
+    x = xs[:, None]
+    y = ys[:, None]
+    dx = x - np.clip(x, l, r)
+    dy = y - np.clip(y, b, t)
+    rr = rs[:, None]
+    return ((dx * dx + dy * dy) < rr * rr).any(axis=1)
+
+
+def step_enemies(enemies, dt: float, player_x: float, player_y: float, wall_index, flow_field=None, elapsed=None):
+    """Шаг всех врагов пакетом; elapsed — время с прошлого шага у каждого (для таймеров)."""
+    n = len(enemies)
+    if n == 0:
+        return
+
+    state = np.array([[getattr(e, f) for f in _FIELDS] for e in enemies], dtype=np.float64)
+    (x, y, radius, speed,
+     knock_vx, knock_vy,
+     shoot_t, dash_cd, dash_t,
+     dash_time, dash_cooldown) = state.T
+    is_charger = np.fromiter((e.enemy_type == "charger" for e in enemies), dtype=bool, count=n)
+
+    timer_dt = dt if elapsed is None else np.asarray(elapsed, dtype=np.float64)
+    np.maximum(shoot_t - timer_dt, 0.0, out=shoot_t)
+    np.maximum(dash_cd - timer_dt, 0.0, out=dash_cd)
+    np.maximum(dash_t - timer_dt, 0.0, out=dash_t)
+
+    decay = KNOCK_DECAY ** timer_dt
+    knock_vx *= decay
+    knock_vy *= decay
+
+    if flow_field is not None:
+        dx, dy, dist = flow_field.directions(x, y, player_x, player_y)
+    else:
+        dx = player_x - x
+        dy = player_y - y
+        dist = np.hypot(dx, dy)
+        dist[dist == 0.0] = 1.0
+        dx /= dist
+        dy /= dist
+
+    dashing = is_charger & (dash_t > 0.0)
+    start_dash = is_charger & ~dashing & (dash_cd <= 0.0) & (dist < CHARGER_DASH_RANGE)
+    dash_t[start_dash] = dash_time[start_dash]
+    dash_cd[start_dash] = dash_cooldown[start_dash]
+
+    move_speed = np.where(dashing, speed * CHARGER_DASH_MULT, speed)
+    nx = x + (dx * move_speed + knock_vx) * dt
+    ny = y + (dy * move_speed + knock_vy) * dt
+
+    # скольжение: сначала ось X, потом Y уже с новым x
+    x0 = x.copy()
+    y0 = y.copy()
+    free_x = ~circles_blocked(nx, y, radius, wall_index)
+    x[free_x] = nx[free_x]
+    free_y = ~circles_blocked(x, ny, radius, wall_index)
+    y[free_y] = ny[free_y]
+    vel_x = (x - x0) / dt
+    vel_y = (y - y0) / dt
+
+    rows = np.stack([x, y, knock_vx, knock_vy, shoot_t, dash_cd, dash_t, vel_x, vel_y], axis=1).tolist()
+    for e, row in zip(enemies, rows):
+        (e.x, e.y, e.knock_vx, e.knock_vy,
+         e._shoot_timer, e._dash_cd, e._dash_t, e.vel_x, e.vel_y) = row
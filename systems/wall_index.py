@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+
+from systems.spatial_hash import CellIndex
+
+
+class WallIndex:
+    """Статический индекс стен уровня: границы посчитаны заранее и разложены по тайловым корзинам."""
+
+    def __init__(self, walls, cell_size: float):
+        self.walls = list(walls)
+        self.cell_size = float(cell_size)
+        self.bounds = [(w.left(), w.right(), w.bottom(), w.top()) for w in self.walls]
+        # те же границы колонками (l, r, b, t) — для пакетных проверок в NumPy
+        self.bounds_array = np.array(self.bounds, dtype=np.float64).reshape(-1, 4)
+
+        self._cells = {}  # (cx, cy) -> list[wall_id]
+        cs = self.cell_size
+        for i, (l, r, b, t) in enumerate(self.bounds):
+            for cx in range(math.floor(l / cs), math.floor(r / cs) + 1):
+                for cy in range(math.floor(b / cs), math.floor(t / cs) + 1):
+                    self._cells.setdefault((cx, cy), []).append(i)
+        self._cell_index = None
+
+    def __iter__(self):
+        return iter(self.walls)
+
+    def __len__(self):
+        return len(self.walls)
+
+    @property
+    def cell_index(self) -> CellIndex:
+        """Те же корзины в массивах NumPy — для пакетных запросов тысяч точек сразу."""
+        if self._cell_index is None:
+            self._cell_index = CellIndex.from_buckets(self._cells, self.cell_size)
+        return self._cell_index
+
+    def _ids_near(self, x: float, y: float, reach: float):
+        cs = self.cell_size
+        x0 = math.floor((x - reach) / cs)
+        x1 = math.floor((x + reach) / cs)
+        y0 = math.floor((y - reach) / cs)
+        y1 = math.floor((y + reach) / cs)
+
+        cells = self._cells
+        if x0 == x1 and y0 == y1:
+            return cells.get((x0, y0), ())
+
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
+
+    def ids_around_cell(self, cx: int, cy: int):
+        """id стен в ячейке (cx, cy) и её 8 соседях — хватает для кругов радиусом <= cell_size."""
+        cells = self._cells
+        found = set()
+        for ix in range(cx - 1, cx + 2):
+            for iy in range(cy - 1, cy + 2):
+                bucket = cells.get((ix, iy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
+
+    def near(self, x: float, y: float, reach: float):
+        """Стены, которые могут задеть круг радиуса reach вокруг (x, y), в исходном порядке."""
+        walls = self.walls
+        return [walls[i] for i in self._ids_near(x, y, reach)]
+
+    def circle_hit(self, cx: float, cy: float, cr: float) -> bool:
+        """То же, что any(circle_aabb_hit(...) for r in walls), но только по ближайшим стенам."""
+        bounds = self.bounds
+        rr = cr * cr
+        for i in self._ids_near(cx, cy, cr):
+            l, r, b, t = bounds[i]
+            dx = cx - min(max(cx, l), r)
+            dy = cy - min(max(cy, b), t)
+            if (dx * dx + dy * dy) < rr:
+                return True
+        return False
@@ -0,0 +1,71 @@
+import arcade
+import numpy as np
+
+from ui.quad_batch import QuadBatch
+
+
+BAR_HEIGHT = 6
+BAR_OFFSET = 12  # от низа тела до верха полоски
+
+BACK_COLOR = arcade.color.DIM_GRAY
+FILL_COLOR = arcade.color.GREEN
+
+
+class HealthBars:
+    """Полоски HP игрока и врагов одним пакетом: сначала все подложки, потом все заливки.
+
+    Геометрия считается массивами по всем телам сразу и уходит в QuadBatch
+    одним draw call. hide_full — не рисовать полоски врагов с полным HP.
+    """
+
+    def __init__(self, ctx, hide_full: bool = False):
+        self.batch = QuadBatch(ctx)
+        self.hide_full = bool(hide_full)
+        self.last_drawn = 0
+
+    def draw(self, player, enemies, alpha: float):
+        bodies = [player]
+        bodies.extend(enemies)
+        state = np.array(
+            [(b.prev_x, b.prev_y, b.x, b.y, b.radius, b.hp, b.max_hp) for b in bodies],
+            dtype=np.float64
+        )
+        prev_x, prev_y, x, y, radius, hp, max_hp = state.T
+
+        keep = max_hp > 0
+        if self.hide_full:
+            full = hp >= max_hp
+            full[0] = False  # у игрока полоска есть всегда
+            keep &= ~full
+        if not keep.all():
+            prev_x, prev_y, x, y = prev_x[keep], prev_y[keep], x[keep], y[keep]
+            radius, hp, max_hp = radius[keep], hp[keep], max_hp[keep]
+
+        n = x.shape[0]
+        self.last_drawn = n
+        if n == 0:
+            return
+
+        # та же интерполяция, что и у тел
+        x = prev_x + (x - prev_x) * alpha
+        y = prev_y + (y - prev_y) * alpha
+        width = radius * 2
+        left = x - radius
+        bottom = y - radius - BAR_OFFSET
+        frac = np.clip(hp / max_hp, 0.0, 1.0)
+
+        rects = np.empty((2 * n, 4), dtype=np.float32)
+        rects[:n, 0] = left
+        rects[:n, 1] = bottom
+        rects[:n, 2] = width
+        rects[:n, 3] = BAR_HEIGHT
+        rects[n:, 0] = left
+        rects[n:, 1] = bottom
+        rects[n:, 2] = width * frac
+        rects[n:, 3] = BAR_HEIGHT
+
+        colors = np.empty((2 * n, 4), dtype=np.uint8)
+        colors[:n] = tuple(BACK_COLOR)
+        colors[n:] = tuple(FILL_COLOR)
+
+        self.batch.draw(rects, colors)
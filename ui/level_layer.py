@@ -0,0 +1,86 @@
+import arcade
+
+from arcade.camera import Camera2D
+from arcade.shape_list import ShapeElementList, create_rectangle_filled
+
+
+FLOOR_COLOR = arcade.color.DARK_OLIVE_GREEN
+WALL_COLOR = arcade.color.DARK_SLATE_GRAY
+
+
+class StaticLevelLayer:
+    """Пол и стены уровня одним готовым пакетом геометрии.
+
+    Стены не двигаются, поэтому пакет собирается один раз на уровень
+    (по world.level_generation) и в кадре рисуется одним вызовом.
+    """
+
+    def __init__(self):
+        self.shapes = None
+        self._level_generation = None
+
+    def sync(self, world):
+        if self._level_generation == world.level_generation and self.shapes is not None:
+            return
+        self._level_generation = world.level_generation
+
+        shapes = ShapeElementList()
+        shapes.append(create_rectangle_filled(
+            world.arena_w_px / 2, world.arena_h_px / 2,
+            world.arena_w_px, world.arena_h_px, FLOOR_COLOR
+        ))
+        for r in world.walls:
+            shapes.append(create_rectangle_filled(r.cx, r.cy, r.w, r.h, WALL_COLOR))
+        self.shapes = shapes
+
+    def draw(self):
+        if self.shapes is not None:
+            self.shapes.draw()
+
+
+class Minimap:
+    """Уменьшенная карта в углу экрана: тот же слой уровня под своей камерой + точки врагов."""
+
+    DOT_PX = 3
+    MARGIN = 10
+
+    def __init__(self, window, layer: StaticLevelLayer, width: int = 240):
+        self.window = window
+        self.layer = layer
+        self.width = int(width)
+        self.visible = True
+        self.camera = None
+        self._arena = None
+
+    def _sync_camera(self, world):
+        arena = (world.arena_w_px, world.arena_h_px)
+        if self._arena == arena and self.camera is not None:
+            return
+        self._arena = arena
+
+        w = self.width
+        h = max(1, int(w * arena[1] / arena[0]))
+        left = self.window.width - w - self.MARGIN
+        bottom = self.MARGIN
+        self.camera = Camera2D(
+            viewport=arcade.LBWH(left, bottom, w, h),
+            position=(arena[0] / 2, arena[1] / 2),
+            zoom=w / arena[0],
+        )
+
+    def draw(self, world, view=None):
+        if not self.visible:
+            return
+        self.layer.sync(world)
+        self._sync_camera(world)
+
+        # размер точки задаётся в мировых единицах, переводим из пикселей экрана
+        px = 1.0 / self.camera.zoom
+        with self.camera.activate():
+            self.layer.draw()
+            if world.enemies:
+                arcade.draw_points([(e.x, e.y) for e in world.enemies], arcade.color.RED, self.DOT_PX * px)
+            arcade.draw_points([(world.player.x, world.player.y)], arcade.color.WHITE, (self.DOT_PX + 2) * px)
+            if view is not None:
+                l, r, b, t = view
+                arcade.draw_lrbt_rectangle_outline(l, r, b, t, arcade.color.WHITE, px)
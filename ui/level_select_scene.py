@@ -1,15 +1,10 @@
 import arcade
 import arcade.gui as gui
-import json
-import os
 
+from core.level_registry import get_level_registry
 from ui.widgets import CallbackButton
 
 
-DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
-LEVELS_PATH = os.path.join(DATA_DIR, "levels.json")
-
-
 class LevelSelectScene(arcade.View):
     def __init__(self, window, scene_manager, db, audio, username: str):
         super().__init__(window)
@@ -21,11 +16,7 @@ class LevelSelectScene(arcade.View):
         self.ui = gui.UIManager()
         self.anchor = None
 
-        self.levels = self._load_levels()
-
-    def _load_levels(self):
-        with open(LEVELS_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        self.levels = get_level_registry().levels
 
     def on_show_view(self):
         arcade.set_background_color(arcade.color.DARK_SLATE_BLUE)
@@ -0,0 +1,46 @@
+import arcade
+
+from systems.profiler import STAGES
+
+
+class ProfilerOverlay:
+    """Полупрозрачная таблица поверх игры: среднее/худшее по этапам и счётчики."""
+
+    LINE_H = 16
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.visible = False
+        self._lines = [
+            arcade.Text("", 0, 0, arcade.color.WHITE, 11, font_name=("Consolas", "Courier New", "monospace"))
+            for _ in range(len(STAGES) + 4)
+        ]
+
+    def draw(self, window):
+        if not self.visible:
+            return
+
+        stages, avg_total, worst_total = self.profiler.summary()
+        counts = self.profiler.last_counts()
+
+        rows = [f"{'stage':12s} {'avg ms':>8s} {'worst':>8s}"]
+        for stage in STAGES:
+            avg, worst = stages.get(stage, (0.0, 0.0))
+            rows.append(f"{stage:12s} {avg:8.3f} {worst:8.3f}")
+        rows.append(f"{'frame':12s} {avg_total:8.3f} {worst_total:8.3f}")
+        rows.append("  ".join(f"{k}={v}" for k, v in counts.items()))
+        csv_state = ("CSV -> " + str(self.profiler.csv_path)) if self.profiler.csv_active else "CSV off (F4)"
+        rows.append(f"frames={len(self.profiler.frames)}  {csv_state}")
+
+        width = 360
+        height = self.LINE_H * len(rows) + 12
+        left = window.width - width - 10
+        top = window.height - 10
+        arcade.draw_lrbt_rectangle_filled(left, left + width, top - height, top, (0, 0, 0, 170))
+
+        for i, text in enumerate(rows):
+            line = self._lines[i]
+            line.text = text
+            line.x = left + 8
+            line.y = top - 8 - (i + 1) * self.LINE_H + 4
+            line.draw()
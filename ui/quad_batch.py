@@ -0,0 +1,121 @@
+import numpy as np
+
+from arcade.gl import BufferDescription
+
+
+_VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+in vec2 in_vert;
+in vec4 in_rect;
+in vec4 in_color;
+
+out vec4 v_color;
+out vec2 v_local;
+
+void main() {
+    vec2 pos = in_rect.xy + in_vert * in_rect.zw;
+    gl_Position = window.projection * window.view * vec4(pos, 0.0, 1.0);
+    v_color = in_color;
+    v_local = in_vert * 2.0 - 1.0;
+}
+"""
+
+_FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+in vec2 v_local;
+out vec4 f_color;
+
+void main() {
+    f_color = v_color;
+}
+"""
+
+# тот же квад, но вписанный круг со сглаженным краем
+_CIRCLE_FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+in vec2 v_local;
+out vec4 f_color;
+
+void main() {
+    float d = length(v_local);
+    float edge = fwidth(d);
+    float a = 1.0 - smoothstep(1.0 - edge, 1.0, d);
+    if (a <= 0.0) {
+        discard;
+    }
+    f_color = vec4(v_color.rgb, v_color.a * a);
+}
+"""
+
+
+class QuadBatch:
+    """Много залитых прямоугольников за один инстансный draw call.
+
+    Прямоугольники (left, bottom, width, height) и цвета RGBA (uint8)
+    приходят массивами NumPy и целиком заливаются в один буфер инстансов.
+    Рисуется в текущей камере (через общий WindowBlock арки).
+    С round=True в каждый прямоугольник вписывается круг.
+    """
+
+    def __init__(self, ctx, capacity: int = 1024, round: bool = False):
+        self.ctx = ctx
+        self.program = ctx.program(
+            vertex_shader=_VERTEX_SHADER,
+            fragment_shader=_CIRCLE_FRAGMENT_SHADER if round else _FRAGMENT_SHADER
+        )
+        # единичный квадрат полосой из двух треугольников
+        self._quad = ctx.buffer(data=np.array([0, 0, 1, 0, 0, 1, 1, 1], dtype=np.float32).tobytes())
+        self.capacity = 0
+        self._rects = None
+        self._colors = None
+        self._geometry = None
+        self._reserve(max(1, int(capacity)))
+
+    def _reserve(self, n: int):
+        if n <= self.capacity:
+            return
+        cap = max(n, self.capacity * 2)
+        self.capacity = cap
+        self._rects = self.ctx.buffer(reserve=cap * 4 * 4)
+        self._colors = self.ctx.buffer(reserve=cap * 4)
+        self._geometry = self.ctx.geometry(
+            [
+                BufferDescription(self._quad, "2f", ["in_vert"]),
+                BufferDescription(self._rects, "4f", ["in_rect"], instanced=True),
+                BufferDescription(self._colors, "4f1", ["in_color"], instanced=True),
+            ],
+            mode=self.ctx.TRIANGLE_STRIP,
+        )
+
+    def draw(self, rects, colors):
+        """rects — (n, 4) float, colors — (n, 4) uint8."""
+        n = len(rects)
+        if n == 0:
+            return
+        self._reserve(n)
+        self._rects.write(np.ascontiguousarray(rects, dtype=np.float32).tobytes())
+        self._colors.write(np.ascontiguousarray(colors, dtype=np.uint8).tobytes())
+        self.ctx.enable(self.ctx.BLEND)
+        self._geometry.render(self.program, instances=n)
+
+    def draw_circles(self, xs, ys, radii, colors):
+        """Круги с центрами (xs, ys) — для батча с round=True."""
+        n = len(xs)
+        if n == 0:
+            return
+        rects = np.empty((n, 4), dtype=np.float32)
+        rects[:, 0] = xs - radii
+        rects[:, 1] = ys - radii
+        rects[:, 2] = radii * 2
+        rects[:, 3] = radii * 2
+        self.draw(rects, colors)
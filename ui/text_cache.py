@@ -0,0 +1,51 @@
+import arcade
+
+
+def prewarm_glyphs(strings, font_size: float, font_name=("calibri", "arial")):
+    """Разложить строки заранее, чтобы глифы (кириллица) попали в атлас шрифта до первого кадра."""
+    arcade.Text(" ".join(strings), 0, 0, arcade.color.WHITE, font_size, font_name=font_name)
+
+
+class LabelCache:
+    """Одна готовая arcade.Text на каждую строку подписи; в кадре меняется только позиция."""
+
+    def __init__(self, font_size: float = 12, color=arcade.color.WHITE):
+        self.font_size = font_size
+        self.color = color
+        self._texts = {}
+
+    def get(self, label: str):
+        text = self._texts.get(label)
+        if text is None:
+            text = arcade.Text(
+                label, 0, 0, self.color, self.font_size,
+                anchor_x="center", anchor_y="center"
+            )
+            self._texts[label] = text
+        return text
+
+    def prewarm(self, labels):
+        for label in labels:
+            self.get(label)
+
+    def draw(self, label: str, x: float, y: float):
+        text = self.get(label)
+        text.position = (x, y)
+        text.draw()
+
+
+class HudLine:
+    """Строка HUD, которая пересобирается, только когда поменялись её значения."""
+
+    def __init__(self, fmt, x: float, y: float, font_size: float, color=arcade.color.WHITE):
+        self.fmt = fmt
+        self._values = None
+        self.text = arcade.Text("", x, y, color, font_size)
+
+    def update(self, *values):
+        if values != self._values:
+            self._values = values
+            self.text.text = self.fmt(*values)
+
+    def draw(self):
+        self.text.draw()
@@ -0,0 +1,48 @@
+import arcade
+
+
+# фабрики текстур по форме: (размер, цвет) -> Texture
+_FACTORIES = {
+    "square": lambda size, color: arcade.make_soft_square_texture(size, color, 255, 255),
+}
+
+
+def _color_key(color):
+    c = tuple(int(v) for v in color)
+    if len(c) == 3:
+        c = c + (255,)
+    return c
+
+
+class TextureRegistry:
+    """Кэш текстур по (форма, размер, цвет); каждая строится раз и сразу кладётся в атлас окна."""
+
+    def __init__(self):
+        self._textures = {}
+        self._atlas = None
+
+    def _get_atlas(self):
+        if self._atlas is None:
+            self._atlas = arcade.get_window().ctx.default_atlas
+        return self._atlas
+
+    def get(self, shape: str, size: int, color):
+        key = (shape, int(size), _color_key(color))
+        tex = self._textures.get(key)
+        if tex is None:
+            factory = _FACTORIES.get(shape)
+            if factory is None:
+                raise ValueError("Unknown texture shape: " + str(shape))
+            tex = factory(key[1], key[2])
+            self._get_atlas().add(tex)
+            self._textures[key] = tex
+        return tex
+
+    def prewarm(self, keys):
+        """Построить заранее набор текстур [(форма, размер, цвет), ...] — без рывка в первом кадре."""
+        for shape, size, color in keys:
+            self.get(shape, size, color)
+
+
+# один реестр на процесс: игрок, враги и всё новое берут текстуры отсюда
+textures = TextureRegistry()
@@ -0,0 +1,157 @@
+import arcade
+import numpy as np
+
+from ui.texture_registry import textures
+from ui.text_cache import LabelCache
+from ui.level_layer import StaticLevelLayer
+from ui.health_bars import HealthBars
+from ui.quad_batch import QuadBatch
+
+
+ENEMY_COLORS = {
+    "melee": arcade.color.RED_ORANGE,
+    "shooter": arcade.color.LIGHT_CORAL,
+    "charger": arcade.color.MAGENTA,
+    "tank": arcade.color.DARK_RED
+}
+
+ENEMY_LABELS = {
+    "melee": "Боец",
+    "shooter": "Стрелок",
+    "charger": "Рывок",
+    "tank": "Танк"
+}
+
+PLAYER_COLOR = arcade.color.BLUE_SAPPHIRE
+PLAYER_LABEL = "Игрок"
+
+PLAYER_BULLET_COLOR = arcade.color.YELLOW
+ENEMY_BULLET_COLOR = arcade.color.LIGHT_GRAY
+
+# размер исходной текстуры тела; на экран тянется до диаметра
+BODY_TEXTURE_SIZE = 64
+
+
+# насколько подпись и полоска HP выступают за тело — запас при отсечении по кадру
+CULL_MARGIN = 24
+
+
+def in_view(xs, ys, reach, view):
+    """Маска точек, чей круг радиуса reach задевает прямоугольник кадра (l, r, b, t)."""
+    l, r, b, t = view
+    return (xs + reach >= l) & (xs - reach <= r) & (ys + reach >= b) & (ys - reach <= t)
+
+
+def lerp_pos(body, alpha: float):
+    """Позиция тела между двумя последними тиками (интерполяция отрисовки)."""
+    return (
+        body.prev_x + (body.x - body.prev_x) * alpha,
+        body.prev_y + (body.y - body.prev_y) * alpha
+    )
+
+
+class WorldRenderer:
+    """Рисует состояние World в мировых координатах (внутри камеры)."""
+
+    def __init__(self, world):
+        self.world = world
+        textures.prewarm(
+            [("square", BODY_TEXTURE_SIZE, PLAYER_COLOR)]
+            + [("square", BODY_TEXTURE_SIZE, c) for c in ENEMY_COLORS.values()]
+        )
+        self.player_texture = textures.get("square", BODY_TEXTURE_SIZE, PLAYER_COLOR)
+        # подписи раскладываются один раз (заодно прогреваются кириллические глифы)
+        self.labels = LabelCache(12)
+        self.labels.prewarm([PLAYER_LABEL] + list(ENEMY_LABELS.values()))
+        # пол и стены: собираются раз на уровень, рисуются одним вызовом (его же рисует миникарта)
+        self.level_layer = StaticLevelLayer()
+        # полоски HP всех тел — одним draw call после тел
+        ctx = arcade.get_window().ctx
+        self.hp_bars = HealthBars(ctx, world.cfg.hp_bar_hide_full)
+        # пули и частицы — кругами одним инстансным вызовом прямо из массивов хранилищ
+        self.circles = QuadBatch(ctx, world.cfg.particle_capacity, round=True)
+        # сколько отсечено кадром в последней отрисовке (для оверлея профайлера)
+        self.cull_counts = {"culled_enemies": 0, "culled_bullets": 0, "culled_particles": 0}
+
+    def _draw_player(self, alpha: float):
+        p = self.world.player
+        x, y = lerp_pos(p, alpha)
+        size = p.radius * 2
+        arcade.draw_texture_rect(self.player_texture, arcade.rect.XYWH(x, y, size, size))
+        self.labels.draw(PLAYER_LABEL, x, y + p.radius + 10)
+
+    def _draw_enemy(self, e, x: float, y: float):
+        size = e.radius * 2
+        color = ENEMY_COLORS.get(e.enemy_type, arcade.color.RED)
+        texture = textures.get("square", BODY_TEXTURE_SIZE, color)
+        arcade.draw_texture_rect(texture, arcade.rect.XYWH(x, y, size, size))
+        label = ENEMY_LABELS.get(e.enemy_type, e.enemy_type)
+        self.labels.draw(label, x, y + e.radius + 10)
+
+    def _visible_enemies(self, alpha: float, view):
+        """Видимые враги и их интерполированные позиции."""
+        enemies = self.world.enemies
+        if not enemies:
+            return [], [], []
+        state = np.array([(e.prev_x, e.prev_y, e.x, e.y, e.radius) for e in enemies], dtype=np.float64)
+        prev_x, prev_y, x, y, radius = state.T
+        x = prev_x + (x - prev_x) * alpha
+        y = prev_y + (y - prev_y) * alpha
+        if view is None:
+            return enemies, x.tolist(), y.tolist()
+        keep = np.flatnonzero(in_view(x, y, radius + CULL_MARGIN, view))
+        return [enemies[i] for i in keep.tolist()], x[keep].tolist(), y[keep].tolist()
+
+    def draw(self, alpha: float, view=None):
+        """view — (left, right, bottom, top) кадра камеры; всё вне него не рисуется."""
+        w = self.world
+        self.level_layer.sync(w)
+        self.level_layer.draw()
+
+        self._draw_player(alpha)
+
+        enemies, ex, ey = self._visible_enemies(alpha, view)
+        for e, x, y in zip(enemies, ex, ey):
+            self._draw_enemy(e, x, y)
+
+        self.hp_bars.draw(w.player, enemies, alpha)
+
+        xs = []
+        ys = []
+        rs = []
+        colors = []
+        culled_bullets = 0
+        for store, color in ((w.projectiles, PLAYER_BULLET_COLOR), (w.enemy_projectiles, ENEMY_BULLET_COLOR)):
+            bx, by = store.lerp_positions(alpha)
+            br = store.radius[:store.count]
+            if view is not None:
+                keep = in_view(bx, by, br, view)
+                culled_bullets += store.count - int(keep.sum())
+                bx, by, br = bx[keep], by[keep], br[keep]
+            xs.append(bx)
+            ys.append(by)
+            rs.append(br)
+            c = np.empty((bx.shape[0], 4), dtype=np.uint8)
+            c[:] = tuple(color)
+            colors.append(c)
+
+        ps = w.particles
+        live = np.flatnonzero(ps.alive)
+        px, py = ps.lerp_positions(live, alpha, w.fixed_dt)
+        total_particles = live.size
+        if view is not None:
+            keep = in_view(px, py, ps.size[live], view)
+            live, px, py = live[keep], px[keep], py[keep]
+        c = np.empty((live.size, 4), dtype=np.uint8)
+        c[:, :3] = ps.color[live]
+        c[:, 3] = ps.alpha(live)
+        xs.append(px)
+        ys.append(py)
+        rs.append(np.maximum(ps.size[live], 1.0))
+        colors.append(c)
+
+        self.circles.draw_circles(np.concatenate(xs), np.concatenate(ys), np.concatenate(rs), np.concatenate(colors))
+
+        self.cull_counts["culled_enemies"] = len(w.enemies) - len(enemies)
+        self.cull_counts["culled_bullets"] = culled_bullets
+        self.cull_counts["culled_particles"] = int(total_particles - live.size)